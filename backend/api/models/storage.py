@@ -92,6 +92,12 @@ class StorageCreate(BaseModel):
     access_key: Optional[str] = Field(default=None, description="S3 access key")
     secret_key: Optional[str] = Field(default=None, description="S3 secret key")
     region: Optional[str] = Field(default=None, description="AWS region")
+    max_concurrency: Optional[int] = Field(
+        default=None, ge=1, le=64, description="Parallel parts per S3 transfer"
+    )
+    multipart_chunk_mb: Optional[int] = Field(
+        default=None, ge=5, le=5120, description="S3 multipart part size in MiB"
+    )
 
     # --- SMB fields (required when provider is 'smb') ---
     server: Optional[str] = Field(default=None, description="SMB server hostname/IP")
@@ -154,6 +160,8 @@ class StorageUpdate(BaseModel):
     access_key: Optional[str] = None
     secret_key: Optional[str] = None
     region: Optional[str] = None
+    max_concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+    multipart_chunk_mb: Optional[int] = Field(default=None, ge=5, le=5120)
 
     # SMB
     server: Optional[str] = None
@@ -183,6 +191,8 @@ class StorageResponse(BaseModel):
     endpoint_url: Optional[str] = None
     bucket: Optional[str] = None
     region: Optional[str] = None
+    max_concurrency: Optional[int] = None
+    multipart_chunk_mb: Optional[int] = None
 
     # SMB
     server: Optional[str] = None
@@ -5,7 +5,7 @@ from InquirerPy.separator import Separator
 from rich.table import Table
 
 from cli import console, manager
-from utils.ui import print_header, get_selection, get_input
+from utils.ui import print_menu_header, get_selection, get_input
 from utils.stats import DashboardStats
 
 
@@ -14,8 +14,7 @@ def dashboard_menu() -> None:
     stats = DashboardStats(manager.config_manager, manager)
 
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Dashboard ═══[/bold cyan]\n")
+        print_menu_header("Dashboard")
 
         choices = [
             Choice(value="overview", name="📊 Overview"),
@@ -47,8 +46,7 @@ def dashboard_menu() -> None:
 
 def show_overview(stats: DashboardStats) -> None:
     """Show overview statistics"""
-    print_header()
-    console.print("\n[bold cyan]═══ Overview Statistics ═══[/bold cyan]\n")
+    print_menu_header("Overview Statistics")
 
     data = stats.get_overview_stats()
 
@@ -69,8 +67,7 @@ def show_overview(stats: DashboardStats) -> None:
 
 def show_database_stats(stats: DashboardStats) -> None:
     """Show per-database statistics"""
-    print_header()
-    console.print("\n[bold cyan]═══ Database Statistics ═══[/bold cyan]\n")
+    print_menu_header("Database Statistics")
 
     data = stats.get_database_stats()
 
@@ -112,8 +109,7 @@ def show_database_stats(stats: DashboardStats) -> None:
 
 def show_recent_activity(stats: DashboardStats) -> None:
     """Show recent backup activity"""
-    print_header()
-    console.print("\n[bold cyan]═══ Recent Activity (Last 7 Days) ═══[/bold cyan]\n")
+    print_menu_header("Recent Activity (Last 7 Days)")
 
     data = stats.get_recent_activity(days=7)
 
@@ -145,8 +141,7 @@ def show_recent_activity(stats: DashboardStats) -> None:
 
 def show_storage_breakdown(stats: DashboardStats) -> None:
     """Show storage usage breakdown"""
-    print_header()
-    console.print("\n[bold cyan]═══ Storage Breakdown ═══[/bold cyan]\n")
+    print_menu_header("Storage Breakdown")
 
     data = stats.get_storage_breakdown()
 
@@ -181,8 +176,7 @@ def show_storage_breakdown(stats: DashboardStats) -> None:
 
 def show_health_status(stats: DashboardStats) -> None:
     """Show system health status"""
-    print_header()
-    console.print("\n[bold cyan]═══ Health Status ═══[/bold cyan]\n")
+    print_menu_header("Health Status")
 
     data = stats.get_health_status()
 
@@ -10,7 +10,7 @@ from InquirerPy.separator import Separator
 
 from cli import console, manager
 from utils.ui import (
-    print_header,
+    print_menu_header,
     get_input,
     print_success,
     print_error,
@@ -54,8 +54,7 @@ def _get_s3_storage(
 
 def manage_databases_menu() -> None:
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Manage Databases ═══[/bold cyan]\n")
+        print_menu_header("Manage Databases")
 
         dbs = manager.list_databases()
         if not dbs:
@@ -107,8 +106,7 @@ def db_actions_menu(db_id: int) -> None:
         if not db:
             return
 
-        print_header()
-        console.print(f"\n[bold cyan]═══ Database: {db['name']} ═══[/bold cyan]\n")
+        print_menu_header(f"Database: {db['name']}")
 
         # Show S3 status
         if db.get("s3_enabled"):
@@ -450,8 +448,7 @@ def restore_wizard(db_id: int) -> None:
 
 def restore_from_s3_wizard(db_id: int) -> None:
     """Restore database from S3 backup"""
-    print_header()
-    console.print("\n[bold cyan]═══ Restore from S3 ═══[/bold cyan]\n")
+    print_menu_header("Restore from S3")
 
     db, storage = _get_s3_storage(db_id)
     if not db or not storage:
@@ -522,8 +519,7 @@ def delete_database_wizard(db_id: int) -> bool:
 
 def sync_backups_wizard(db_id: int) -> None:
     """Sync backups between local and S3"""
-    print_header()
-    console.print("\n[bold cyan]═══ Sync Backups ═══[/bold cyan]\n")
+    print_menu_header("Sync Backups")
 
     db, storage = _get_s3_storage(db_id)
     if not db or not storage:
@@ -620,8 +616,7 @@ def sync_backups_wizard(db_id: int) -> None:
 
 
 def add_database_wizard() -> None:
-    print_header()
-    console.print("\n[bold cyan]═══ Add New Database ═══[/bold cyan]\n")
+    print_menu_header("Add New Database")
 
     name = get_input("Display Name (alias):")
     if not name:
@@ -731,8 +726,7 @@ def edit_database_wizard(db_id: int) -> None:
     if not db:
         return
 
-    print_header()
-    console.print(f"\n[bold cyan]═══ Edit Database: {db['name']} ═══[/bold cyan]\n")
+    print_menu_header(f"Edit Database: {db['name']}")
 
     name = get_input("Display Name (alias):", default=db["name"])
 
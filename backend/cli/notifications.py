@@ -1,13 +1,14 @@
 """Notification settings menu"""
 
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional
 
 from InquirerPy.base.control import Choice
 from InquirerPy.separator import Separator
 
 from cli import console, manager
+from core.notifications import NotificationManager, NotificationType
 from utils.ui import (
-    print_header,
+    print_menu_header,
     get_selection,
     get_input,
     get_confirm,
@@ -15,6 +16,24 @@ from utils.ui import (
     print_error,
 )
 
+_NOTIF_CHANNELS = (
+    ("email", "Email"),
+    ("slack", "Slack"),
+    ("teams", "Teams"),
+    ("discord", "Discord"),
+)
+
+_NOTIF_MENU_CHOICES: list[Any] = [
+    Choice(value="email", name="📧 Configure Email (SMTP)"),
+    Choice(value="slack", name="💬 Configure Slack Webhook"),
+    Choice(value="teams", name="👔 Configure Microsoft Teams Webhook"),
+    Choice(value="discord", name="🎮 Configure Discord Webhook"),
+    Separator(),
+    Choice(value="test", name="🧪 Test Notifications"),
+    Separator(),
+    Choice(value="back", name="← Back"),
+]
+
 
 def _status_label(enabled: Optional[bool]) -> str:
     return "✅ Enabled" if enabled else "❌ Disabled"
@@ -28,8 +47,7 @@ def _parse_int(value: str, default: int) -> int:
 
 
 def _configure_webhook(channel_key: str, title: str, help_text: str) -> None:
-    print_header()
-    console.print(f"\n[bold cyan]═══ {title} ═══[/bold cyan]\n")
+    print_menu_header(f"{title}")
 
     current = manager.config_manager.get_notification_settings(channel_key)
     enabled = get_confirm(
@@ -41,14 +59,23 @@ def _configure_webhook(channel_key: str, title: str, help_text: str) -> None:
     )
 
     if enabled:
-        console.print("\n[bold]Webhook URL:[/bold]")
-        console.print(f"[dim]{help_text}[/dim]\n")
+        console.print(f"\n[bold]Webhook URL:[/bold]\n[dim]{help_text}[/dim]\n")
 
         webhook_url = get_input("Webhook URL:", default=current.get("webhook_url", ""))
         if not webhook_url:
             print_error("Webhook URL is required")
             return
+    else:
+        webhook_url = current.get("webhook_url", "")
+
+    # Nothing changed: skip the config write (and the storage sync it triggers)
+    if enabled == current.get("enabled", False) and (
+        not enabled or webhook_url == current.get("webhook_url")
+    ):
+        print_success(f"{title} {'enabled' if enabled else 'disabled'} (unchanged)")
+        return
 
+    if enabled:
         manager.config_manager.update_notification_settings(
             channel_key, enabled=True, webhook_url=webhook_url
         )
@@ -61,63 +88,33 @@ def _configure_webhook(channel_key: str, title: str, help_text: str) -> None:
 def notification_menu() -> None:
     """Configure notification settings"""
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Notification Settings ═══[/bold cyan]\n")
-
-        # Get current settings
-        email_settings = manager.config_manager.get_notification_settings("email")
-        slack_settings = manager.config_manager.get_notification_settings("slack")
-        teams_settings = manager.config_manager.get_notification_settings("teams")
-        discord_settings = manager.config_manager.get_notification_settings("discord")
+        print_menu_header("Notification Settings")
 
-        # Show status
-        console.print(
-            f"[bold]Email:[/bold] {_status_label(email_settings.get('enabled'))}"
-        )
+        # Show status of every channel in a single render
+        settings = manager.config_manager.get_notification_settings()
         console.print(
-            f"[bold]Slack:[/bold] {_status_label(slack_settings.get('enabled'))}"
+            "\n".join(
+                f"[bold]{label}:[/bold] "
+                f"{_status_label(settings.get(key, {}).get('enabled'))}"
+                for key, label in _NOTIF_CHANNELS
+            )
+            + "\n"
         )
-        console.print(
-            f"[bold]Teams:[/bold] {_status_label(teams_settings.get('enabled'))}"
-        )
-        console.print(
-            f"[bold]Discord:[/bold] {_status_label(discord_settings.get('enabled'))}"
-        )
-        console.print()
 
-        choices: list[Any] = [
-            Choice(value="email", name="📧 Configure Email (SMTP)"),
-            Choice(value="slack", name="💬 Configure Slack Webhook"),
-            Choice(value="teams", name="👔 Configure Microsoft Teams Webhook"),
-            Choice(value="discord", name="🎮 Configure Discord Webhook"),
-            Separator(),
-            Choice(value="test", name="🧪 Test Notifications"),
-            Separator(),
-            Choice(value="back", name="← Back"),
-        ]
-
-        action = get_selection("Notification Settings", choices)
+        action = get_selection("Notification Settings", _NOTIF_MENU_CHOICES)
 
         if action == "back":
             break
-        elif action == "email":
-            configure_email_notifications()
-        elif action == "slack":
-            configure_slack_notifications()
-        elif action == "teams":
-            configure_teams_notifications()
-        elif action == "discord":
-            configure_discord_notifications()
-        elif action == "test":
-            test_notifications()
+        handler = _NOTIF_ACTIONS.get(action)
+        if handler:
+            handler()
 
         get_input("\nPress Enter to continue...")
 
 
 def configure_email_notifications() -> None:
     """Configure email notification settings"""
-    print_header()
-    console.print("\n[bold cyan]═══ Email Notifications (SMTP) ═══[/bold cyan]\n")
+    print_menu_header("Email Notifications (SMTP)")
 
     current = manager.config_manager.get_notification_settings("email")
 
@@ -153,15 +150,16 @@ def configure_email_notifications() -> None:
         from_email = get_input("From Email:", default=current.get("from_email", ""))
 
         # Recipients
-        console.print("\n[bold]Recipients:[/bold]")
         current_emails = current.get("to_emails", [])
+        recipients_help = "\n[bold]Recipients:[/bold]"
         if current_emails:
-            console.print(f"Current: {', '.join(current_emails)}")
+            recipients_help += f"\nCurrent: {', '.join(current_emails)}"
+        console.print(recipients_help)
 
         to_emails_str = get_input(
             "To Emails (comma-separated):", default=",".join(current_emails)
         )
-        to_emails = [e.strip() for e in to_emails_str.split(",") if e.strip()]
+        to_emails = [s for e in to_emails_str.split(",") if (s := e.strip())]
 
         # Save
         manager.config_manager.update_notification_settings(
@@ -207,14 +205,11 @@ def configure_discord_notifications() -> None:
 
 def test_notifications() -> None:
     """Send test notifications"""
-    print_header()
-    console.print("\n[bold cyan]═══ Test Notifications ═══[/bold cyan]\n")
+    print_menu_header("Test Notifications")
 
     console.print("Sending test notifications to all enabled channels...\n")
 
     # Reload notification manager with current settings
-    from core.notifications import NotificationManager, NotificationType
-
     notif_manager = NotificationManager(manager.config_manager.config)
 
     # Send test notification
@@ -235,3 +230,12 @@ def test_notifications() -> None:
         console.print(
             "\nEnsure at least one notification channel is enabled and configured."
         )
+
+
+_NOTIF_ACTIONS: Dict[str, Callable[[], None]] = {
+    "email": configure_email_notifications,
+    "slack": configure_slack_notifications,
+    "teams": configure_teams_notifications,
+    "discord": configure_discord_notifications,
+    "test": test_notifications,
+}
@@ -1,6 +1,7 @@
 """Scheduling menus and wizards"""
 
-from typing import Any, Dict, Optional
+import re
+from typing import Any, Callable, Dict, Optional
 
 from rich.table import Table
 from InquirerPy.base.control import Choice
@@ -8,7 +9,7 @@ from InquirerPy.separator import Separator
 
 from cli import console, manager, cron_manager
 from utils.ui import (
-    print_header,
+    print_menu_header,
     get_input,
     print_success,
     print_error,
@@ -21,6 +22,52 @@ from utils.ui import (
 # SCHEDULING
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Input validators for the simple schedule builder
+_TIME_RE = re.compile(r"^([01]?\d|2[0-3]):([0-5]?\d)$")  # HH:MM, 00:00-23:59
+_HOURS_RE = re.compile(r"^0?([1-9]|1\d|2[0-4])$")  # 1-24
+_DOM_RE = re.compile(r"^0?([1-9]|1\d|2[0-8])$")  # 1-28
+
+_MODE_CHOICES: list[Any] = [
+    Choice("simple", "Simple schedule (recommended)"),
+    Choice("preset", "Preset cron"),
+    Choice("custom", "Custom cron"),
+    Choice("back", "← Back"),
+]
+
+_PRESET_SCHEDULES: list[Any] = [
+    Choice("back", "← Back"),
+    Separator(),
+    Choice("0 0 * * *", "Daily @ Midnight"),
+    Choice("0 0 * * 0", "Weekly (Sunday)"),
+    Choice("0 * * * *", "Hourly"),
+    Choice("0 */6 * * *", "Every 6 Hours"),
+    Separator(),
+    Choice("custom", "Custom Schedule"),
+]
+
+_FREQ_CHOICES: list[Any] = [
+    Choice("daily", "Daily"),
+    Choice("weekly", "Weekly"),
+    Choice("monthly", "Monthly"),
+    Choice("hourly", "Every N hours"),
+    Choice("back", "← Back"),
+]
+
+_DAY_CHOICES: list[Any] = [
+    Choice(str(i), name)
+    for i, name in enumerate(
+        ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+    )
+]
+
+_SCHEDULE_MENU_CHOICES: list[Any] = [
+    Choice("add", "Schedule New Backup"),
+    Choice("list", "List Scheduled Jobs"),
+    Choice("manage", "Manage Scheduled Jobs"),
+    Separator(),
+    Choice("back", "Back to Main Menu"),
+]
+
 
 def _job_label(job: Dict[str, Any]) -> str:
     status = "Enabled" if job.get("enabled") else "Disabled"
@@ -29,26 +76,15 @@ def _job_label(job: Dict[str, Any]) -> str:
 
 def schedule_menu() -> None:
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Scheduling ═══[/bold cyan]\n")
-
-        choices: list[Any] = [
-            Choice("add", "Schedule New Backup"),
-            Choice("list", "List Scheduled Jobs"),
-            Choice("manage", "Manage Scheduled Jobs"),
-            Separator(),
-            Choice("back", "Back to Main Menu"),
-        ]
-        action = get_selection("Scheduling Menu", choices)
+        print_menu_header("Scheduling")
+
+        action = get_selection("Scheduling Menu", _SCHEDULE_MENU_CHOICES)
 
         if action == "back":
             break
-        elif action == "add":
-            schedule_wizard()
-        elif action == "list":
-            list_jobs_wizard()
-        elif action == "manage":
-            manage_jobs_wizard()
+        handler = _SCHEDULE_ACTIONS.get(action)
+        if handler:
+            handler()
 
 
 def list_jobs_wizard() -> None:
@@ -75,19 +111,24 @@ def manage_jobs_wizard() -> None:
         get_input("Press Enter...")
         return
 
-    print_header()
-    console.print("\n[bold cyan]═══ Manage Scheduled Jobs ═══[/bold cyan]\n")
+    print_menu_header("Manage Scheduled Jobs")
 
-    choices = [
-        Choice(value="back", name="← Back"),
-        Separator(),
-    ] + [Choice(value=job["id"], name=_job_label(job)) for job in jobs]
+    # Index jobs while building their choices so the selection lookup is O(1)
+    jobs_by_id: Dict[int, Dict[str, Any]] = {}
+    choices: list[Any] = [Choice(value="back", name="← Back"), Separator()]
+    for entry in jobs:
+        try:
+            job_id = int(entry["id"])
+        except ValueError:
+            continue  # Hand-edited comment that doesn't name a database id
+        jobs_by_id[job_id] = entry
+        choices.append(Choice(value=job_id, name=_job_label(entry)))
 
     selected = get_selection("Select Job", choices)
     if selected == "back":
         return
 
-    job = next((j for j in jobs if str(j.get("id")) == str(selected)), None)
+    job = jobs_by_id.get(selected)
     if not job:
         print_error("Job not found")
         get_input("Press Enter...")
@@ -108,7 +149,7 @@ def manage_jobs_wizard() -> None:
         new_schedule = _prompt_schedule(default=job["schedule"])
         if not new_schedule:
             return
-        if cron_manager.update_schedule(int(job["id"]), new_schedule):
+        if cron_manager.update_schedule(selected, new_schedule):
             print_success("Schedule updated.")
         else:
             print_error("Failed to update schedule")
@@ -116,7 +157,7 @@ def manage_jobs_wizard() -> None:
 
     elif action == "toggle":
         desired = not job["enabled"]
-        if cron_manager.set_job_enabled(int(job["id"]), desired):
+        if cron_manager.set_job_enabled(selected, desired):
             print_success("Job enabled" if desired else "Job disabled")
         else:
             print_error("Failed to update job status")
@@ -124,7 +165,7 @@ def manage_jobs_wizard() -> None:
 
     elif action == "delete":
         if get_confirm("Delete this scheduled job?", default=False):
-            cron_manager.remove_job(int(job["id"]))
+            cron_manager.remove_job(selected)
             print_success("Job deleted")
         get_input("Press Enter...")
 
@@ -157,14 +198,15 @@ def schedule_wizard() -> None:
         get_input("Press Enter...")
 
 
+_SCHEDULE_ACTIONS: Dict[str, Callable[[], None]] = {
+    "add": schedule_wizard,
+    "list": list_jobs_wizard,
+    "manage": manage_jobs_wizard,
+}
+
+
 def _prompt_schedule(default: str = "0 0 * * *") -> Optional[str]:
-    mode_choices = [
-        Choice("simple", "Simple schedule (recommended)"),
-        Choice("preset", "Preset cron"),
-        Choice("custom", "Custom cron"),
-        Choice("back", "← Back"),
-    ]
-    mode = get_selection("Schedule Type", mode_choices)
+    mode = get_selection("Schedule Type", _MODE_CHOICES)
     if mode == "back":
         return None
 
@@ -175,18 +217,7 @@ def _prompt_schedule(default: str = "0 0 * * *") -> Optional[str]:
         print_info("Cron Format: * * * * * (min hour day month day_of_week)")
         return get_input("Enter Cron Schedule:", default)
 
-    presets: list[Any] = [
-        Choice("back", "← Back"),
-        Separator(),
-        Choice("0 0 * * *", "Daily @ Midnight"),
-        Choice("0 0 * * 0", "Weekly (Sunday)"),
-        Choice("0 * * * *", "Hourly"),
-        Choice("0 */6 * * *", "Every 6 Hours"),
-        Separator(),
-        Choice("custom", "Custom Schedule"),
-    ]
-
-    selected_schedule = get_selection("Select Schedule Preset", presets)
+    selected_schedule = get_selection("Select Schedule Preset", _PRESET_SCHEDULES)
     if selected_schedule == "back":
         return None
     if selected_schedule == "custom":
@@ -199,64 +230,35 @@ def _simple_schedule_builder() -> Optional[str]:
     console.print("\n[bold]Simple schedule builder[/bold]")
     console.print("Choose frequency and time; we will build the cron expression.")
 
-    freq_choices = [
-        Choice("daily", "Daily"),
-        Choice("weekly", "Weekly"),
-        Choice("monthly", "Monthly"),
-        Choice("hourly", "Every N hours"),
-        Choice("back", "← Back"),
-    ]
-    frequency = get_selection("Frequency", freq_choices)
+    frequency = get_selection("Frequency", _FREQ_CHOICES)
     if frequency == "back":
         return None
 
     if frequency == "hourly":
-        hours_text = get_input("Every how many hours?", "6")
-        try:
-            hours = int(hours_text)
-            if hours < 1 or hours > 24:
-                raise ValueError()
-        except Exception:
+        hours_match = _HOURS_RE.match(get_input("Every how many hours?", "6").strip())
+        if not hours_match:
             print_error("Invalid hour interval (1-24)")
             return None
-        return f"0 */{hours} * * *"
+        return f"0 */{int(hours_match[1])} * * *"
 
-    time_str = get_input("Time (HH:MM)", "02:00")
-    try:
-        hour_str, minute_str = time_str.split(":")
-        hour = int(hour_str)
-        minute = int(minute_str)
-        if hour < 0 or hour > 23 or minute < 0 or minute > 59:
-            raise ValueError()
-    except Exception:
+    time_match = _TIME_RE.match(get_input("Time (HH:MM)", "02:00").strip())
+    if not time_match:
         print_error("Invalid time format")
         return None
+    hour, minute = int(time_match[1]), int(time_match[2])
 
     if frequency == "daily":
         return f"{minute} {hour} * * *"
 
     if frequency == "weekly":
-        day_choices = [
-            Choice("0", "Sunday"),
-            Choice("1", "Monday"),
-            Choice("2", "Tuesday"),
-            Choice("3", "Wednesday"),
-            Choice("4", "Thursday"),
-            Choice("5", "Friday"),
-            Choice("6", "Saturday"),
-        ]
-        day = get_selection("Day of week", day_choices)
+        day = get_selection("Day of week", _DAY_CHOICES)
         return f"{minute} {hour} * * {day}"
 
     if frequency == "monthly":
-        day_text = get_input("Day of month (1-28)", "1")
-        try:
-            day = int(day_text)
-            if day < 1 or day > 28:
-                raise ValueError()
-        except Exception:
+        day_match = _DOM_RE.match(get_input("Day of month (1-28)", "1").strip())
+        if not day_match:
             print_error("Invalid day of month (1-28)")
             return None
-        return f"{minute} {hour} {day} * *"
+        return f"{minute} {hour} {int(day_match[1])} * *"
 
     return None
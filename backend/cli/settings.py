@@ -1,12 +1,32 @@
 """Settings menu"""
 
+import atexit
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from rich.table import Table
 from InquirerPy.base.control import Choice
 from InquirerPy.separator import Separator
 
 from cli import console, manager
+from cli.notifications import notification_menu
+from core.compression import (
+    DEFAULT_LEVELS,
+    get_compression_info,
+    get_default_compression_settings,
+)
+from core.encryption import (
+    is_encryption_available,
+    get_encryption_info,
+    generate_random_password,
+)
+from utils.config_export import ConfigExporter
 from utils.ui import (
-    print_header,
+    print_menu_header,
     get_input,
+    get_number,
     print_success,
     print_error,
     print_info,
@@ -19,58 +39,139 @@ from utils.ui import (
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+_SETTINGS_MENU_CHOICES: list[Any] = [
+    Choice(value="config_sync", name="Configure Config Sync"),
+    Choice(value="sync_now", name="Sync Config to Storage Now"),
+    Choice(value="download", name="Download Config from Storage"),
+    Separator(),
+    Choice(value="export", name="📤 Export Configuration"),
+    Choice(value="import", name="📥 Import Configuration"),
+    Separator(),
+    Choice(value="compression", name="Configure Compression"),
+    Choice(value="encryption", name="Configure Encryption"),
+    Choice(value="notifications", name="Configure Notifications"),
+    Separator(),
+    Choice(value="back", name="← Back to Main Menu"),
+]
+
+# Fixed head of the config-sync target picker; targets are appended per call
+_SYNC_TARGET_BASE_CHOICES: list[Any] = [
+    Choice(value="back", name="← Back"),
+    Separator(),
+    Choice(value=None, name="Disable config sync"),
+    Separator(),
+]
+
+_PASSWORD_UPDATE_CHOICES: list[Any] = [
+    Choice(value="keep", name="Keep current password"),
+    Choice(value="change", name="Change password"),
+    Choice(value="generate", name="Generate new random password"),
+]
+
+_PASSWORD_NEW_CHOICES: list[Any] = [
+    Choice(value="manual", name="Enter password manually"),
+    Choice(value="generate", name="Generate random password"),
+]
+
+# Actions after which the status block at the top of the menu must be re-read;
+# the config_sync branch patches it itself, as it already has the target list
+_STATUS_CHANGING_ACTIONS = frozenset(
+    {"download", "import", "compression", "encryption"}
+)
+# Actions that can replace the storage targets, invalidating their cached names
+_TARGETS_CHANGING_ACTIONS = frozenset({"download", "import"})
+
+
+# Config uploads triggered from the menu run here so navigation isn't blocked
+# on the storage round-trip. A single worker keeps uploads strictly ordered;
+# shutdown at exit waits for any upload still in flight.
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="config-sync")
+atexit.register(_sync_executor.shutdown, wait=True)
+
+
+def _report_background_sync(future: "Future[bool]") -> None:
+    exc = future.exception()
+    if exc is not None:
+        console.print(f"[red]Config sync failed: {exc}[/red]")
+    elif future.result():
+        console.print("[green]✓ Config synced to storage[/green]")
+    else:
+        console.print("[red]Config sync failed[/red]")
+
+
+def _sync_to_storage_in_background() -> None:
+    future = _sync_executor.submit(manager.config_sync.sync_to_storage)
+    future.add_done_callback(_report_background_sync)
+
+
+def _storage_target_names() -> Dict[int, str]:
+    """Map storage target ids to display names"""
+    return {t["id"]: t["name"] for t in manager.storage_manager.list_storage()}
+
+
+def _read_settings_status(target_names: Dict[int, str]) -> Dict[str, Any]:
+    """Snapshot the values shown in the settings menu status block"""
+    target_id = manager.config_sync.get_config_target_id()
+    return {
+        "target_id": target_id,
+        "target_name": target_names.get(target_id) if target_id else None,
+        "compression": manager.config_manager.get_compression_settings(),
+        "encryption": manager.config_manager.get_encryption_settings(),
+    }
+
+
+def _status_table(status: Dict[str, Any]) -> Table:
+    """Lay out the config sync / compression / encryption status rows"""
+    table = Table(show_header=False, box=None, padding=(0, 1, 0, 0))
+
+    # Config sync
+    if status["target_id"]:
+        sync_label = f"✅ Enabled → {status['target_name']}"
+    else:
+        sync_label = "❌ Disabled"
+    table.add_row("[bold]Config Sync:[/bold]", sync_label)
+
+    # Compression
+    compression_settings = status["compression"]
+    if compression_settings.get("enabled", False):
+        algo = compression_settings.get("algorithm", "gzip")
+        level = compression_settings.get("level", DEFAULT_LEVELS.get(algo, 6))
+        compression_label = f"✅ {algo.upper()} (level {level})"
+    else:
+        compression_label = "❌ Disabled"
+    table.add_row("[bold]Compression:[/bold]", compression_label)
+
+    # Encryption
+    encryption_settings = status["encryption"]
+    if encryption_settings.get("enabled", False):
+        has_password = encryption_settings.get("password") is not None
+        enc_status = "🔐 AES-256" if has_password else "⚠️  No password"
+        encryption_label = f"✅ {enc_status}"
+    else:
+        encryption_label = "❌ Disabled"
+    table.add_row("[bold]Encryption:[/bold]", encryption_label)
+
+    # Blank spacer line before the menu prompt
+    table.add_row()
+    return table
+
+
 def settings_menu() -> None:
     """Settings menu for config sync and other options"""
+    status: Optional[Dict[str, Any]] = None
+    target_names: Optional[Dict[int, str]] = None
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Settings ═══[/bold cyan]\n")
-
-        # Show current config sync status
-        current_target_id = manager.config_sync.get_config_target_id()
-        if current_target_id:
-            target_name = manager.storage_manager.get_storage_name(current_target_id)
-            console.print(f"[bold]Config Sync:[/bold] ✅ Enabled → {target_name}")
-        else:
-            console.print("[bold]Config Sync:[/bold] ❌ Disabled")
-
-        # Show compression status
-        compression_settings = manager.config_manager.get_compression_settings()
-        if compression_settings.get("enabled", False):
-            algo = compression_settings.get("algorithm", "gzip")
-            level = compression_settings.get("level", 6)
-            console.print(
-                f"[bold]Compression:[/bold] ✅ {algo.upper()} (level {level})"
-            )
-        else:
-            console.print("[bold]Compression:[/bold] ❌ Disabled")
-
-        # Show encryption status
-        encryption_settings = manager.config_manager.get_encryption_settings()
-        if encryption_settings.get("enabled", False):
-            has_password = encryption_settings.get("password") is not None
-            status = "🔐 AES-256" if has_password else "⚠️  No password"
-            console.print(f"[bold]Encryption:[/bold] ✅ {status}")
-        else:
-            console.print("[bold]Encryption:[/bold] ❌ Disabled")
-
-        console.print()
-
-        choices = [
-            Choice(value="config_sync", name="Configure Config Sync"),
-            Choice(value="sync_now", name="Sync Config to Storage Now"),
-            Choice(value="download", name="Download Config from Storage"),
-            Separator(),
-            Choice(value="export", name="📤 Export Configuration"),
-            Choice(value="import", name="📥 Import Configuration"),
-            Separator(),
-            Choice(value="compression", name="Configure Compression"),
-            Choice(value="encryption", name="Configure Encryption"),
-            Choice(value="notifications", name="Configure Notifications"),
-            Separator(),
-            Choice(value="back", name="← Back to Main Menu"),
-        ]
+        print_menu_header("Settings")
+
+        if target_names is None:
+            target_names = _storage_target_names()
+        if status is None:
+            status = _read_settings_status(target_names)
 
-        action = get_selection("Settings Menu", choices)
+        current_target_id = status["target_id"]
+        console.print(_status_table(status))
+
+        action = get_selection("Settings Menu", _SETTINGS_MENU_CHOICES)
 
         if action == "config_sync":
             targets = manager.storage_manager.list_storage()
@@ -82,12 +183,10 @@ def settings_menu() -> None:
                 get_input("Press Enter to continue...")
                 continue
 
-            target_choices = [
-                Choice(value="back", name="← Back"),
-                Separator(),
-                Choice(value=None, name="Disable config sync"),
-                Separator(),
-            ] + [Choice(value=t["id"], name=t["name"]) for t in targets]
+            target_names = {t["id"]: t["name"] for t in targets}
+            target_choices = _SYNC_TARGET_BASE_CHOICES + [
+                Choice(value=t_id, name=name) for t_id, name in target_names.items()
+            ]
 
             target_id = get_selection("Select target for config sync", target_choices)
 
@@ -95,11 +194,14 @@ def settings_menu() -> None:
                 continue
 
             manager.config_sync.set_config_target(target_id)
+            status["target_id"] = target_id
+            status["target_name"] = target_names.get(target_id) if target_id else None
 
             if target_id:
                 print_success("Config sync enabled")
                 if get_confirm("Upload config to storage now?"):
-                    manager.config_sync.sync_to_storage()
+                    _sync_to_storage_in_background()
+                    print_info("Config upload started in the background")
             else:
                 print_success("Config sync disabled")
 
@@ -107,9 +209,12 @@ def settings_menu() -> None:
 
         elif action == "sync_now":
             if current_target_id:
-                console.print("[yellow]Syncing config to storage...[/yellow]")
-                manager.config_sync.sync_to_storage()
-                print_success("Config synced!")
+                with console.status("Syncing config to storage..."):
+                    synced = manager.config_sync.sync_to_storage()
+                if synced:
+                    print_success("Config synced!")
+                else:
+                    print_error("Config sync failed")
             else:
                 print_info("Config sync not configured")
             get_input("Press Enter to continue...")
@@ -130,13 +235,16 @@ def settings_menu() -> None:
             encryption_config_menu()
 
         elif action == "notifications":
-            from cli.notifications import notification_menu
-
             notification_menu()
 
         elif action == "back":
             break
 
+        if action in _STATUS_CHANGING_ACTIONS:
+            status = None
+        if action in _TARGETS_CHANGING_ACTIONS:
+            target_names = None
+
 
 def download_config_from_storage() -> None:
     """Download configuration from Storage"""
@@ -160,11 +268,7 @@ def download_config_from_storage() -> None:
 
 def export_configuration() -> None:
     """Export configuration wizard"""
-    from utils.config_export import ConfigExporter
-    from utils.ui import print_success, print_error
-
-    print_header()
-    console.print("\n[bold cyan]═══ Export Configuration ═══[/bold cyan]\n")
+    print_menu_header("Export Configuration")
 
     include_backups = get_confirm("Include backup files in export?", default=False)
     output_path = get_input("Export path (leave empty for default):")
@@ -192,11 +296,7 @@ def export_configuration() -> None:
 
 def import_configuration() -> None:
     """Import configuration wizard"""
-    from utils.config_export import ConfigExporter
-    from utils.ui import print_success, print_error, print_info
-
-    print_header()
-    console.print("\n[bold cyan]═══ Import Configuration ═══[/bold cyan]\n")
+    print_menu_header("Import Configuration")
 
     print_info("⚠️  Warning: This will modify your current configuration!")
     console.print()
@@ -212,15 +312,13 @@ def import_configuration() -> None:
     )
 
     # Check if export includes backups
-    from pathlib import Path
-    import zipfile
-
     restore_backups = False
     if Path(import_path).suffix == ".zip":
         try:
             with zipfile.ZipFile(import_path, "r") as zipf:
-                if "backups/" in zipf.namelist() or any(
-                    "backups" in name for name in zipf.namelist()
+                # Exports store backup files under a top-level backups/ dir
+                if any(
+                    info.filename.startswith("backups/") for info in zipf.infolist()
                 ):
                     restore_backups = get_confirm(
                         "Export contains backups. Restore them?", default=False
@@ -262,10 +360,7 @@ def import_configuration() -> None:
 
 def compression_config_menu() -> None:
     """Configure compression settings"""
-    from core.compression import get_available_algorithms, get_compression_info
-
-    print_header()
-    console.print("\n[bold cyan]═══ Configure Compression ═══[/bold cyan]\n")
+    print_menu_header("Configure Compression")
 
     # Show available algorithms
     info = get_compression_info()
@@ -292,13 +387,16 @@ def compression_config_menu() -> None:
     ):
 
         # Select algorithm
-        available = get_available_algorithms()
+        # Availability is already part of info; no second probe needed
         algo_choices = [
-            Choice(value=a, name=f"{a.upper()} - {info[a]['description']}")
-            for a in available
+            Choice(value=a, name=f"{a.upper()} - {details['description']}")
+            for a, details in info.items()
+            if details["available"]
         ]
 
-        current_algo = current.get("algorithm", "gzip")
+        current_algo = current.get(
+            "algorithm", get_default_compression_settings()["algorithm"]
+        )
         algorithm = str(
             get_selection(
                 f"Select compression algorithm (current: {current_algo})",
@@ -308,16 +406,20 @@ def compression_config_menu() -> None:
 
         # Select level
         level_info = info[algorithm]["level_range"]
-        current_level = current.get("level", 6)
-        level_str = get_input(
-            f"Compression level {level_info} (current: {current_level}): ",
-            default=str(current_level),
+        current_level = current.get("level", DEFAULT_LEVELS.get(current_algo, 6))
+        # A level tuned for another algorithm is a poor default for this one
+        default_level = (
+            current_level
+            if algorithm == current_algo
+            else DEFAULT_LEVELS.get(algorithm, 6)
+        )
+        level_min, level_max = (int(bound) for bound in level_info.split("-"))
+        level = get_number(
+            f"Compression level {level_info} (current: {current_level}):",
+            default=min(max(default_level, level_min), level_max),
+            min_allowed=level_min,
+            max_allowed=level_max,
         )
-
-        try:
-            level = int(level_str)
-        except Exception:
-            level = 6
 
         # Save settings
         manager.config_manager.update_compression_settings(
@@ -331,16 +433,21 @@ def compression_config_menu() -> None:
     get_input("Press Enter to continue...")
 
 
-def encryption_config_menu() -> None:
-    """Configure encryption settings"""
-    from core.encryption import (
-        is_encryption_available,
-        get_encryption_info,
-        generate_random_password,
+def _generate_and_show_password() -> str:
+    """Generate a random encryption password and wait until the user saved it"""
+    password = generate_random_password(32)
+    console.print("\n[bold green]Generated password:[/bold green]")
+    console.print(f"[bold cyan]{password}[/bold cyan]\n")
+    console.print(
+        "[bold yellow]⚠️  SAVE THIS PASSWORD! It cannot be recovered![/bold yellow]\n"
     )
+    get_input("Press Enter after saving the password...")
+    return password
 
-    print_header()
-    console.print("\n[bold cyan]═══ Configure Encryption ═══[/bold cyan]\n")
+
+def encryption_config_menu() -> None:
+    """Configure encryption settings"""
+    print_menu_header("Configure Encryption")
 
     # Check if encryption is available
     if not is_encryption_available():
@@ -382,13 +489,9 @@ def encryption_config_menu() -> None:
         if current_password:
             console.print(f"[bold]Current password:[/bold] {'*' * 16} (set)")
 
-            choices = [
-                Choice(value="keep", name="Keep current password"),
-                Choice(value="change", name="Change password"),
-                Choice(value="generate", name="Generate new random password"),
-            ]
-
-            password_action = get_selection("Password options", choices)
+            password_action = get_selection(
+                "Password options", _PASSWORD_UPDATE_CHOICES
+            )
 
             if password_action == "keep":
                 password = current_password
@@ -398,23 +501,13 @@ def encryption_config_menu() -> None:
                     print_info("No password provided, keeping current")
                     password = current_password
             else:  # generate
-                password = generate_random_password(32)
-                console.print("\n[bold green]Generated password:[/bold green]")
-                console.print(f"[bold cyan]{password}[/bold cyan]\n")
-                console.print(
-                    "[bold yellow]⚠️  SAVE THIS PASSWORD! It cannot be recovered!"
-                    "[/bold yellow]\n"
-                )
-                get_input("Press Enter after saving the password...")
+                password = _generate_and_show_password()
         else:
             console.print("[bold]No password set yet.[/bold]\n")
 
-            choices = [
-                Choice(value="manual", name="Enter password manually"),
-                Choice(value="generate", name="Generate random password"),
-            ]
-
-            password_action = get_selection("Choose password method", choices)
+            password_action = get_selection(
+                "Choose password method", _PASSWORD_NEW_CHOICES
+            )
 
             if password_action == "manual":
                 password = get_input("Enter encryption password: ")
@@ -423,14 +516,7 @@ def encryption_config_menu() -> None:
                     get_input("Press Enter to continue...")
                     return
             else:  # generate
-                password = generate_random_password(32)
-                console.print("\n[bold green]Generated password:[/bold green]")
-                console.print(f"[bold cyan]{password}[/bold cyan]\n")
-                console.print(
-                    "[bold yellow]⚠️  SAVE THIS PASSWORD! It cannot be recovered!"
-                    "[/bold yellow]\n"
-                )
-                get_input("Press Enter after saving the password...")
+                password = _generate_and_show_password()
 
         # Save settings
         manager.config_manager.update_encryption_settings(
@@ -1,14 +1,15 @@
 """Storage target management menus and wizards"""
 
-from typing import Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from rich.table import Table
 from InquirerPy.base.control import Choice
 from InquirerPy.separator import Separator
 
 from cli import console, manager
+from core.storage_provider import StorageProvider
 from utils.ui import (
-    print_header,
+    print_menu_header,
     get_input,
     print_success,
     print_error,
@@ -21,12 +22,44 @@ from utils.ui import (
 # STORAGE MANAGEMENT
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_PROVIDER_CHOICES: list[Any] = [
+    Choice(value="minio", name="Minio (S3 Compatible)"),
+    Choice(value="garage", name="Garage (S3 Compatible)"),
+    Choice(value="s3", name="Amazon S3"),
+    Choice(value="other", name="Other S3-compatible"),
+    Separator(),
+    Choice(value="smb", name="SMB / CIFS (Windows Share)"),
+]
+
+# "Manage Target" only makes sense once at least one target exists
+_TARGETS_MENU_CHOICES_EMPTY: list[Any] = [
+    Choice(value="add", name="Add New Storage Target"),
+    Separator(),
+    Choice(value="back", name="Back to Main Menu"),
+]
+_TARGETS_MENU_CHOICES: list[Any] = [
+    Choice(value="add", name="Add New Storage Target"),
+    Choice(value="manage", name="Manage Target"),
+    Separator(),
+    Choice(value="back", name="Back to Main Menu"),
+]
+
+
+def _target_row(target: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """Flatten a storage target into its table columns in a single pass"""
+    provider = target.get("provider", "s3")
+    # Format details based on provider
+    if provider == "smb":
+        details = f"{target.get('share_name')} @ {target.get('server')}"
+    else:
+        details = target.get("bucket", "")
+    return str(target["id"]), target["name"], provider, details
+
 
 def manage_storage_targets_menu() -> None:
     """Menu for managing storage target configurations"""
     while True:
-        print_header()
-        console.print("\n[bold cyan]═══ Storage Targets ═══[/bold cyan]\n")
+        print_menu_header("Storage Targets")
 
         targets = manager.storage_manager.list_storage()
 
@@ -37,52 +70,34 @@ def manage_storage_targets_menu() -> None:
             table.add_column("Provider")
             table.add_column("Details")
 
-            for target in targets:
-                # Format details based on provider
-                details = target.get("bucket", "")
-                if target.get("provider") == "smb":
-                    details = f"{target.get('share_name')} @ {target.get('server')}"
-
-                table.add_row(
-                    str(target["id"]),
-                    target["name"],
-                    target.get("provider", "s3"),
-                    details,
-                )
+            for row in map(_target_row, targets):
+                table.add_row(*row)
 
             console.print(table)
         else:
             print_info("No storage targets configured")
 
-        choices: list[Any] = [
-            Choice(value="add", name="Add New Storage Target"),
-        ]
-
-        if targets:
-            choices.insert(1, Choice(value="manage", name="Manage Target"))
-
-        choices.extend(
-            [
-                Separator(),
-                Choice(value="back", name="Back to Main Menu"),
-            ]
-        )
-
+        choices = _TARGETS_MENU_CHOICES if targets else _TARGETS_MENU_CHOICES_EMPTY
         action = get_selection("Storage Targets Menu", choices)
 
-        if action == "add":
-            add_storage_target_wizard()
-        elif action == "manage":
-            if targets:
-                target_choices: list[Any] = [
-                    Choice(value="back", name="← Back"),
-                    Separator(),
-                ] + [Choice(value=t["id"], name=t["name"]) for t in targets]
-                target_id = get_selection("Select target to manage", target_choices)
-                if target_id != "back":
-                    manage_single_target(target_id)
-        elif action == "back":
+        if action == "back":
             break
+        handler = _TARGETS_ACTIONS.get(action)
+        if handler:
+            handler(targets)
+
+
+def _select_target_to_manage(targets: List[Dict[str, Any]]) -> None:
+    """Pick one of the listed targets and open its management menu"""
+    if not targets:
+        return
+    target_choices: list[Any] = [
+        Choice(value="back", name="← Back"),
+        Separator(),
+    ] + [Choice(value=t["id"], name=t["name"]) for t in targets]
+    target_id = get_selection("Select target to manage", target_choices)
+    if target_id != "back":
+        manage_single_target(target_id)
 
 
 def manage_single_target(target_id: int) -> None:
@@ -94,8 +109,7 @@ def manage_single_target(target_id: int) -> None:
             get_input("Press Enter to continue...")
             return
 
-        print_header()
-        console.print(f"\n[bold cyan]═══ Target: {target['name']} ═══[/bold cyan]\n")
+        print_menu_header(f"Target: {target['name']}")
 
         # Display details
         provider = target.get("provider", "s3")
@@ -158,8 +172,7 @@ def manage_single_target(target_id: int) -> None:
 
 def add_storage_target_wizard() -> None:
     """Wizard for adding storage target configuration"""
-    print_header()
-    console.print("\n[bold cyan]═══ Add Storage Target ═══[/bold cyan]\n")
+    print_menu_header("Add Storage Target")
 
     name = get_input("Target Name (display name)")
     if not name:
@@ -167,15 +180,7 @@ def add_storage_target_wizard() -> None:
         get_input("Press Enter to continue...")
         return
 
-    provider_choices = [
-        Choice(value="minio", name="Minio (S3 Compatible)"),
-        Choice(value="garage", name="Garage (S3 Compatible)"),
-        Choice(value="s3", name="Amazon S3"),
-        Choice(value="other", name="Other S3-compatible"),
-        Separator(),
-        Choice(value="smb", name="SMB / CIFS (Windows Share)"),
-    ]
-    provider = get_selection("Select provider", provider_choices)
+    provider = get_selection("Select provider", _PROVIDER_CHOICES)
 
     config = {
         "name": name,
@@ -247,6 +252,13 @@ def add_storage_target_wizard() -> None:
         if endpoint_url:
             config["endpoint_url"] = endpoint_url
 
+    # Let the user skip the network round-trip, e.g. while iterating on creds
+    if get_confirm("Skip connection test?", default=False):
+        target_id = manager.storage_manager.add_storage(config)
+        print_success(f"Storage target added with ID {target_id} (not tested)")
+        get_input("Press Enter to continue...")
+        return
+
     # Test connection before saving
     console.print("\n[yellow]Testing connection...[/yellow]")
 
@@ -262,11 +274,7 @@ def add_storage_target_wizard() -> None:
         # Ideally StorageManager has a `get_provider_class` method or we import them.
 
         # Simplified approach: Use StorageManager's map if exposed or import here
-        from core.s3_storage import S3Storage
-        from core.storage_provider import StorageProvider
-
-        # For SMB, we will need to import it later when created
-
+        # SMB is imported lazily since smbprotocol is an optional dependency
         test_provider: Optional[StorageProvider] = None
         if provider == "smb":
             try:
@@ -276,6 +284,8 @@ def add_storage_target_wizard() -> None:
             except ImportError:
                 print_error("SMB support not installed or implemented yet.")
         else:
+            from core.s3_storage import S3Storage
+
             test_provider = S3Storage(config)
 
         if test_provider and test_provider.test_connection():
@@ -297,8 +307,7 @@ def edit_storage_target_wizard(target_id: int) -> None:
         print_error("Target not found")
         return
 
-    print_header()
-    console.print(f"\n[bold cyan]═══ Edit Target: {target['name']} ═══[/bold cyan]\n")
+    print_menu_header(f"Edit Target: {target['name']}")
 
     name = get_input("Target Name", default=target.get("name", ""))
     if not name:
@@ -353,9 +362,6 @@ def edit_storage_target_wizard(target_id: int) -> None:
     console.print("\n[yellow]Testing updated configuration...[/yellow]")
 
     try:
-        from core.s3_storage import S3Storage
-        from core.storage_provider import StorageProvider
-
         test_provider: Optional[StorageProvider] = None
 
         if current_provider == "smb":
@@ -366,6 +372,8 @@ def edit_storage_target_wizard(target_id: int) -> None:
             except ImportError:
                 print_error("SMB support not installed.")
         else:
+            from core.s3_storage import S3Storage
+
             test_provider = S3Storage(updated_config)
 
         if test_provider and test_provider.test_connection():
@@ -380,3 +388,9 @@ def edit_storage_target_wizard(target_id: int) -> None:
         print_error(f"❌ Test failed: {e}")
 
     get_input("Press Enter to continue...")
+
+
+_TARGETS_ACTIONS: Dict[str, Callable[[List[Dict[str, Any]]], None]] = {
+    "add": lambda _targets: add_storage_target_wizard(),
+    "manage": _select_target_to_manage,
+}
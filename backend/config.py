@@ -1,40 +1,109 @@
+import atexit
+import hashlib
 import json
 import os
 import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+# orjson is an optional, faster drop-in for (de)serializing the config file
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Allow override via env var, default to home dir
 CONFIG_DIR = Path(os.getenv("DBMANAGER_DATA_DIR", Path.home() / ".dbmanager"))
 CONFIG_FILE = CONFIG_DIR / "config.json"
-
-# Sensitive fields that should be encrypted
-SENSITIVE_FIELDS = [
-    "password",
-    "smtp_password",
-    "aws_secret_access_key",
-    "access_key",  # S3 access key id; pairs with secret_key, encrypt to match.
-    "secret_key",
-    "webhook_url",  # Often contains tokens
-    "connection_string",
-    "uri",  # MongoDB URI may embed user:pass — bypassed `password` encryption.
-    "smb_password",
-    "jwt_secret",
-]
+# JWT signing secret (see core.auth), kept out of config.json so creating it
+# doesn't trigger a full config save and storage sync
+JWT_SECRET_FILE = CONFIG_DIR / ".jwt.key"
+
+# Quiet period that coalesces a burst of config saves into one storage sync
+SYNC_DEBOUNCE_SECONDS = 0.5
+
+# Background storage sync, shared by every ConfigManager in the process: they
+# all save the same file, so one worker and one exit hook serve them all.
+# _sync_lock is held for the whole of each upload, flag check included.
+_sync_pending = threading.Event()
+_sync_lock = threading.Lock()
+_sync_start_lock = threading.Lock()
+_sync_thread: Optional[threading.Thread] = None
+_sync_manager: Optional["ConfigManager"] = None  # Latest to request a sync
+
+# Sensitive fields that should be encrypted (a set: checked for every config key)
+SENSITIVE_FIELDS = frozenset(
+    {
+        "password",
+        "smtp_password",
+        "aws_secret_access_key",
+        "access_key",  # S3 access key id; pairs with secret_key, encrypt to match.
+        "secret_key",
+        "webhook_url",  # Often contains tokens
+        "connection_string",
+        "uri",  # MongoDB URI may embed user:pass — bypassed `password` encryption.
+        "smb_password",
+        "jwt_secret",
+    }
+)
+
+
+def _dump_json(data: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _load_json(raw: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _default_compression_settings() -> Dict[str, Any]:
+    """Default compression settings (zstd when available, else gzip)"""
+    from core.compression import get_default_compression_settings
+
+    return get_default_compression_settings()
 
 
 class ConfigManager:
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._ensure_config_exists()
+        # Nesting depth of batch() blocks and whether a save was deferred
+        self._batch_depth = 0
+        self._batch_dirty = False
+        # Created by the sync worker on first use; see _run_sync()
+        self._config_sync: Any = None
+        # Digest of the config as last loaded/saved; see save_config()
+        self._last_saved_digest: Optional[bytes] = None
+        # Sensitive field path -> (plaintext, ciphertext) as last loaded/saved,
+        # so saving an unchanged secret reuses its token instead of re-encrypting
+        self._ciphertexts: Dict[Tuple[Any, ...], Tuple[str, str]] = {}
+        # Database id -> position in config["databases"]; see _db_positions()
+        self._db_index: Dict[int, int] = {}
+        self._max_db_id = 0
+        self._indexed_dbs: Optional[List[Dict[str, Any]]] = None
+        self._indexed_len = 0
+        default_config = self._ensure_config_exists()
         # Initialize security manager
         from core.security import SecurityManager
 
         self.security = SecurityManager(CONFIG_DIR / ".secret.key")
-        self.config = self._load_config()
+        if default_config is not None:
+            # Fresh install: the defaults hold no secrets to decrypt, so use
+            # them as-is; the first save_config() writes the file
+            self.config = default_config
+        else:
+            self.config = self._load_config()
 
-    def _ensure_config_exists(self) -> None:
+    def _ensure_config_exists(self) -> Optional[Dict[str, Any]]:
+        """Create the config dir; return the default config if none exists yet"""
         if not CONFIG_DIR.exists():
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         if not CONFIG_FILE.exists():
@@ -43,7 +112,7 @@ class ConfigManager:
                 "s3_buckets": [],
                 "config_sync_bucket_id": None,
                 "global_settings": {
-                    "compression": {"enabled": False, "algorithm": "gzip", "level": 6},
+                    "compression": _default_compression_settings(),
                     "encryption": {"enabled": False, "password": None},
                 },
                 "schedules": [],
@@ -65,10 +134,12 @@ class ConfigManager:
                     "discord": {"enabled": False, "webhook_url": ""},
                 },
             }
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(default_config, f, indent=4)
+            return default_config
+        return None
 
-    def _process_config(self, data: Any, encrypt: bool = True) -> Any:
+    def _process_config(
+        self, data: Any, encrypt: bool = True, path: Tuple[Any, ...] = ()
+    ) -> Any:
         """Recursively encrypt or decrypt sensitive fields in config"""
         if isinstance(data, dict):
             new_data = {}
@@ -76,40 +147,111 @@ class ConfigManager:
                 if k in SENSITIVE_FIELDS and isinstance(v, str) and v:
                     # Encrypt or decrypt
                     new_data[k] = (
-                        self.security.encrypt(v)
+                        self._encrypt_field(path + (k,), v)
                         if encrypt
-                        else self.security.decrypt(v)
+                        else self._decrypt_field(path + (k,), v)
                     )
                 else:
-                    new_data[k] = self._process_config(v, encrypt)
+                    new_data[k] = self._process_config(v, encrypt, path + (k,))
             return new_data
         elif isinstance(data, list):
-            return [self._process_config(item, encrypt) for item in data]
+            return [
+                self._process_config(item, encrypt, path + (i,))
+                for i, item in enumerate(data)
+            ]
         else:
             return data
 
+    def _encrypt_field(self, path: Tuple[Any, ...], value: str) -> str:
+        cached = self._ciphertexts.get(path)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        token = self.security.encrypt(value)
+        self._ciphertexts[path] = (value, token)
+        return token
+
+    def _decrypt_field(self, path: Tuple[Any, ...], token: str) -> str:
+        value = self.security.decrypt(token)
+        # Legacy plaintext comes back unchanged; leave it to be encrypted on save
+        if value != token:
+            self._ciphertexts[path] = (value, token)
+        return value
+
     def _load_config(self) -> Dict[str, Any]:
         with self._lock:
-            with open(CONFIG_FILE, "r") as f:
-                data = json.load(f)
+            data = _load_json(CONFIG_FILE.read_bytes())
 
         # Decrypt loaded config so it's usable in memory
         processed = self._process_config(data, encrypt=False)
+        self._last_saved_digest = self._config_digest(processed)
         return cast(Dict[str, Any], processed)
 
+    @staticmethod
+    def _config_digest(config: Any) -> bytes:
+        # Digest of the decrypted config: ciphertexts use random IVs, so the
+        # encrypted bytes differ on every save even when nothing changed
+        return hashlib.blake2b(_dump_json(config), digest_size=16).digest()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Coalesce the saves of several mutations into one write and sync"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self.save_config()
+
     def save_config(self) -> None:
+        if self._batch_depth:
+            # Deferred until the outermost batch() block exits
+            self._batch_dirty = True
+            return
+
+        # Nothing changed since the last load/save: skip the write and sync
+        digest = self._config_digest(self.config)
+        if digest == self._last_saved_digest:
+            return
+
         # Create a deep copy with encrypted values for saving
         encrypted_config = self._process_config(self.config, encrypt=True)
 
+        # Write to a temp file and swap it in, so a crash mid-write can never
+        # leave a truncated config behind
+        tmp_file = CONFIG_FILE.with_suffix(".json.tmp")
         with self._lock:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(encrypted_config, f, indent=4)
+            with open(tmp_file, "wb") as f:
+                f.write(_dump_json(encrypted_config))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, CONFIG_FILE)
+        self._last_saved_digest = digest
 
         # Auto-sync to Storage if enabled
         self._sync_to_storage()
 
     def _sync_to_storage(self) -> None:
-        """Sync config to Storage if configured"""
+        """Schedule a debounced sync of config to Storage if configured"""
+        global _sync_manager, _sync_thread
+        if not self.config.get("config_sync_bucket_id"):
+            return
+
+        with _sync_start_lock:
+            _sync_manager = self
+            _sync_pending.set()
+            if _sync_thread is None:
+                # Started on first use so processes that never sync stay
+                # threadless
+                _sync_thread = threading.Thread(
+                    target=_sync_worker, name="config-sync", daemon=True
+                )
+                _sync_thread.start()
+                atexit.register(_flush_sync)
+
+    def _run_sync(self) -> None:
+        """Upload the config now; called with _sync_lock held"""
         try:
             # Avoid circular import
             from core.config_sync import ConfigSync
@@ -118,21 +260,44 @@ class ConfigManager:
             # Only sync if target is configured
             target_id = self.config.get("config_sync_bucket_id")
             if target_id:
-                storage_manager = StorageManager(self)
-                config_sync = ConfigSync(storage_manager, self)
-                config_sync.sync_to_storage(silent=True)
+                # Kept across syncs; ConfigSync itself notices target or
+                # credential changes and rebuilds its storage client
+                if self._config_sync is None:
+                    self._config_sync = ConfigSync(StorageManager(self), self)
+                self._config_sync.sync_to_storage(silent=True)
         except Exception:
             # Silently fail to avoid breaking config saves
             pass
 
+    def _db_positions(self) -> Dict[int, int]:
+        """Map database ids to list positions, reindexing if the list changed"""
+        dbs: List[Dict[str, Any]] = self.config["databases"]
+        # Imports and storage syncs replace the list wholesale, so check it
+        if dbs is not self._indexed_dbs or len(dbs) != self._indexed_len:
+            self._db_index = {db["id"]: i for i, db in enumerate(dbs) if "id" in db}
+            self._max_db_id = max(self._db_index, default=0)
+            self._indexed_dbs = dbs
+            self._indexed_len = len(dbs)
+        return self._db_index
+
+    def _find_database(self, db_id: int) -> Optional[int]:
+        i = self._db_positions().get(db_id)
+        if i is None or self.config["databases"][i].get("id") != db_id:
+            # Miss or stale hit: an entry's id may have been edited in place
+            self._indexed_dbs = None
+            i = self._db_positions().get(db_id)
+        return i
+
     def add_database(self, db_config: Dict[str, Any]) -> int:
+        positions = self._db_positions()
         # Generate a simple ID if not present
         if "id" not in db_config:
-            existing_ids = [db.get("id", 0) for db in self.config["databases"]]
-            new_id = max(existing_ids) + 1 if existing_ids else 1
-            db_config["id"] = new_id
+            db_config["id"] = self._max_db_id + 1
 
         self.config["databases"].append(db_config)
+        positions.setdefault(db_config["id"], self._indexed_len)
+        self._max_db_id = max(self._max_db_id, db_config["id"])
+        self._indexed_len += 1
         self.save_config()
         return int(db_config["id"])
 
@@ -140,26 +305,27 @@ class ConfigManager:
         return cast(List[Dict[str, Any]], self.config.get("databases", []))
 
     def get_database(self, db_id: int) -> Optional[Dict[str, Any]]:
-        for db in self.config["databases"]:
-            if db.get("id") == db_id:
-                return cast(Dict[str, Any], db)
-        return None
+        i = self._find_database(db_id)
+        if i is None:
+            return None
+        return cast(Dict[str, Any], self.config["databases"][i])
 
     def remove_database(self, db_id: int) -> None:
+        # Builds a new list, which _db_positions() reindexes on next use
         self.config["databases"] = [
             db for db in self.config["databases"] if db.get("id") != db_id
         ]
         self.save_config()
 
     def update_database(self, db_id: int, new_config: Dict[str, Any]) -> bool:
-        for i, db in enumerate(self.config["databases"]):
-            if db.get("id") == db_id:
-                # Keep the ID, update everything else
-                new_config["id"] = db_id
-                self.config["databases"][i] = new_config
-                self.save_config()
-                return True
-        return False
+        i = self._find_database(db_id)
+        if i is None:
+            return False
+        # Keep the ID, update everything else
+        new_config["id"] = db_id
+        self.config["databases"][i] = new_config
+        self.save_config()
+        return True
 
     def get_global_settings(self) -> Dict[str, Any]:
         """Get global settings (compression, etc.)"""
@@ -167,7 +333,7 @@ class ConfigManager:
             Dict[str, Any],
             self.config.get(
                 "global_settings",
-                {"compression": {"enabled": False, "algorithm": "gzip", "level": 6}},
+                {"compression": _default_compression_settings()},
             ),
         )
 
@@ -183,9 +349,7 @@ class ConfigManager:
         global_settings = self.get_global_settings()
         return cast(
             Dict[str, Any],
-            global_settings.get(
-                "compression", {"enabled": False, "algorithm": "gzip", "level": 6}
-            ),
+            global_settings.get("compression", _default_compression_settings()),
         )
 
     def update_compression_settings(
@@ -195,7 +359,10 @@ class ConfigManager:
         level: Optional[int] = None,
     ) -> None:
         """Update compression settings"""
-        settings = self.get_compression_settings()
+        global_settings = self.config.setdefault("global_settings", {})
+        settings = global_settings.setdefault(
+            "compression", _default_compression_settings()
+        )
 
         if enabled is not None:
             settings["enabled"] = enabled
@@ -204,9 +371,7 @@ class ConfigManager:
         if level is not None:
             settings["level"] = level
 
-        global_settings = self.get_global_settings()
-        global_settings["compression"] = settings
-        self.update_global_settings(global_settings)
+        self.save_config()
 
     def get_encryption_settings(self) -> Dict[str, Any]:
         """Get encryption settings"""
@@ -220,16 +385,17 @@ class ConfigManager:
         self, enabled: Optional[bool] = None, password: Optional[str] = None
     ) -> None:
         """Update encryption settings"""
-        settings = self.get_encryption_settings()
+        global_settings = self.config.setdefault("global_settings", {})
+        settings = global_settings.setdefault(
+            "encryption", {"enabled": False, "password": None}
+        )
 
         if enabled is not None:
             settings["enabled"] = enabled
         if password is not None:
             settings["password"] = password
 
-        global_settings = self.get_global_settings()
-        global_settings["encryption"] = settings
-        self.update_global_settings(global_settings)
+        self.save_config()
 
     def get_notification_settings(
         self, provider: Optional[str] = None
@@ -314,3 +480,29 @@ class ConfigManager:
             "interval_minutes": interval_minutes,
         }
         self.save_config()
+
+
+def _sync_worker() -> None:
+    """Upload the config once per burst of saves"""
+    while True:
+        _sync_pending.wait()
+        # Let the rest of a burst (e.g. a multi-step wizard) land first
+        time.sleep(SYNC_DEBOUNCE_SECONDS)
+        _run_pending_sync()
+
+
+def _flush_sync() -> None:
+    """Run a still-pending sync before the process exits"""
+    # Also waits out an upload the worker is in the middle of, since the
+    # daemon thread is killed at exit
+    _run_pending_sync()
+
+
+def _run_pending_sync() -> None:
+    with _sync_lock:
+        if not _sync_pending.is_set():
+            return
+        _sync_pending.clear()
+        manager = _sync_manager
+        if manager is not None:
+            manager._run_sync()
@@ -1,19 +1,70 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
+from functools import cached_property, lru_cache
 import os
-from typing import Optional
+from pathlib import Path
+import secrets
+import tempfile
+import time
+from typing import TYPE_CHECKING, Optional
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import ConfigManager
+from config import JWT_SECRET_FILE, ConfigManager
 from db.models.user import User
 from db.repositories.users_repo import get_user_by_username, update_last_login
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=None)
+def _load_or_create_jwt_secret(key_path: Path) -> str:
+    """Read the JWT secret from its key file, generating it on first use"""
+    try:
+        secret = key_path.read_text(encoding="utf-8").strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+
+    secret = secrets.token_urlsafe(32)
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    # Written in full to an owner-only temp file, then linked into place: the
+    # key file never exists half-written, and concurrent first starts agree
+    # on whichever secret was linked first
+    fd, tmp_path = tempfile.mkstemp(prefix=".jwt.", dir=key_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(secret)
+        try:
+            os.link(tmp_path, key_path)
+        except FileExistsError:
+            existing = key_path.read_text(encoding="utf-8").strip()
+            if existing:
+                return existing
+            # Empty leftover file: replace it with ours
+            os.replace(tmp_path, key_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return secret
+
+
+def restore_jwt_secret(secret: str, key_path: Path = JWT_SECRET_FILE) -> None:
+    """Replace the JWT secret with one restored from a config sync or export"""
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".jwt.", dir=key_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(secret)
+        os.replace(tmp_path, key_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    _load_or_create_jwt_secret.cache_clear()
 
-class AuthManager:
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+class AuthManager:
     ALGORITHM = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
     # `aud` and `iss` claims aren't strictly required for a single-app
@@ -22,10 +73,18 @@ class AuthManager:
     # a 401 instead of a confused-deputy authentication.
     JWT_ISSUER = "dbmanager"
     JWT_AUDIENCE = "dbmanager-api"
+    # argon2id at the OWASP minimums (19 MiB, 2 passes, 1 lane). passlib's
+    # defaults (64 MiB, 3 passes) cost ~4x more per login for a self-hosted
+    # tool. Hashes made with them still verify, and are re-hashed to these
+    # (cheaper) parameters on the user's next login.
+    ARGON2_MEMORY_COST = 19456
+    ARGON2_TIME_COST = 2
+    ARGON2_PARALLELISM = 1
     # Pre-computed argon2 hash of a random string, used for constant-time
-    # verification when the username doesn't exist.
+    # verification when the username doesn't exist. Its parameters must match
+    # the ones above so the dummy verify costs the same as a real one.
     DUMMY_HASH = (
-        "$argon2id$v=19$m=65536,t=3,p=4$"
+        "$argon2id$v=19$m=19456,t=2,p=1$"
         "c29tZXNhbHRzb21lc2FsdA$"
         "dGhpc2lzbm90YXJlYWxoYXNodGhpc2lzbm90YXJlYWxo"
     )
@@ -62,19 +121,28 @@ class AuthManager:
                 )
             return env_secret
 
+        # Older versions stored the secret in config.json; keep honouring it so
+        # tokens issued before the upgrade stay valid
         auth_config = self.config_manager.config.get("auth", {})
         secret = auth_config.get("jwt_secret")
-
-        if not secret:
-            import secrets
-
-            secret = secrets.token_urlsafe(32)
-            if "auth" not in self.config_manager.config:
-                self.config_manager.config["auth"] = {}
-            self.config_manager.config["auth"]["jwt_secret"] = secret
-            self.config_manager.save_config()
-
-        return str(secret)
+        if secret:
+            return str(secret)
+
+        return _load_or_create_jwt_secret(JWT_SECRET_FILE)
+
+    @cached_property
+    def pwd_context(self) -> "CryptContext":
+        # Imported on first use: loading passlib and its argon2 backend is
+        # wasted startup time for processes that never hash a password
+        from passlib.context import CryptContext
+
+        return CryptContext(
+            schemes=["argon2"],
+            deprecated="auto",
+            argon2__memory_cost=self.ARGON2_MEMORY_COST,
+            argon2__time_cost=self.ARGON2_TIME_COST,
+            argon2__parallelism=self.ARGON2_PARALLELISM,
+        )
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         try:
@@ -95,14 +163,20 @@ class AuthManager:
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
     ) -> str:
+        from jose import jwt
+
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + (
-            expires_delta or timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
+        # Epoch seconds, which is what jose would reduce datetimes to anyway
+        now = int(time.time())
+        lifetime = (
+            int(expires_delta.total_seconds())
+            if expires_delta
+            else self.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         )
         to_encode.update(
             {
-                "exp": expire,
-                "iat": datetime.now(timezone.utc),
+                "exp": now + lifetime,
+                "iat": now,
                 "iss": self.JWT_ISSUER,
                 "aud": self.JWT_AUDIENCE,
             }
@@ -110,6 +184,8 @@ class AuthManager:
         return str(jwt.encode(to_encode, self.secret_key, algorithm=self.ALGORITHM))
 
     def decode_token(self, token: str) -> Optional[dict]:
+        from jose import JWTError, jwt
+
         try:
             payload = jwt.decode(
                 token,
@@ -135,6 +211,9 @@ class AuthManager:
             return None
         if not self.verify_password(password, user.password_hash):
             return None
+        if self.pwd_context.needs_update(user.password_hash):
+            # Re-hash with the current parameters while we have the password
+            user.password_hash = self.get_password_hash(password)
         await update_last_login(session, user)
         await session.commit()
         return user
@@ -0,0 +1,53 @@
+"""Pool of reusable I/O buffers.
+
+Compression, encryption and checksumming each stream files through
+megabyte-sized buffers. Drawing them from a shared pool lets consecutive and
+concurrent backups reuse the same few buffers instead of allocating (and
+zero-filling) fresh ones for every file.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class BufferPool:
+    """Thread-safe free lists of bytearrays, one list per buffer size"""
+
+    def __init__(self, max_idle: int = 8) -> None:
+        """
+        Args:
+            max_idle: Most buffers of each size kept for reuse; extras returned
+                past this are left to the garbage collector
+        """
+        self.max_idle = max_idle
+        self._free: Dict[int, List[bytearray]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> bytearray:
+        """Take a buffer of exactly size bytes; its contents are undefined"""
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                return free.pop()
+        return bytearray(size)
+
+    def release(self, buf: bytearray) -> None:
+        """Hand a buffer back; the caller must not touch it afterwards"""
+        with self._lock:
+            free = self._free.setdefault(len(buf), [])
+            if len(free) < self.max_idle:
+                free.append(buf)
+
+    @contextmanager
+    def borrow(self, size: int) -> Iterator[bytearray]:
+        """acquire() a buffer for the duration of a with block"""
+        buf = self.acquire(size)
+        try:
+            yield buf
+        finally:
+            self.release(buf)
+
+
+# Shared by the compression, encryption and checksum helpers
+buffer_pool = BufferPool()
@@ -7,9 +7,13 @@ Supports multiple compression algorithms:
 """
 
 import gzip
+import io
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from core.buffer_pool import buffer_pool
 
 # Optional compression libraries
 try:
@@ -27,16 +31,48 @@ except ImportError:
     LZ4_AVAILABLE = False
 
 
+# Files are streamed through the codecs in chunks of this size, so memory use
+# stays flat regardless of backup size
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Extension each algorithm appends to the compressed file
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+
+# Balanced default level for each algorithm
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3, "lz4": 1}
+
+
 class CompressionError(Exception):
     """Raised when compression/decompression fails"""
 
     pass
 
 
+def _read_sequentially(f: io.BufferedIOBase) -> None:
+    """Hint that f is read front to back, so the kernel reads further ahead"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _streamed_copy(src: io.BufferedIOBase, dst: io.BufferedIOBase) -> None:
+    """Copy src to dst through one reused buffer, no per-chunk allocation"""
+    with buffer_pool.borrow(STREAM_CHUNK_SIZE) as buf:
+        view = memoryview(buf)
+        while n := src.readinto(buf):
+            dst.write(view[:n])
+
+
+@lru_cache(maxsize=1)
 def get_available_algorithms() -> list:
     """
     Get list of available compression algorithms.
 
+    Cached, as availability cannot change while the process runs; callers
+    must not mutate the returned list.
+
     Returns:
         List of algorithm names that are available
     """
@@ -51,11 +87,30 @@ def get_available_algorithms() -> list:
     return algorithms
 
 
+def get_default_compression_settings() -> dict:
+    """
+    Get the default (disabled) compression settings.
+
+    Prefers zstd, which is much faster than gzip at a comparable ratio, and
+    falls back to gzip when zstandard is not installed.
+
+    Returns:
+        Dictionary with enabled, algorithm and level keys
+    """
+    algorithm = "zstd" if ZSTD_AVAILABLE else "gzip"
+    return {
+        "enabled": False,
+        "algorithm": algorithm,
+        "level": DEFAULT_LEVELS[algorithm],
+    }
+
+
 def compress_file(
     file_path: str,
     algorithm: str = "gzip",
     level: int = 6,
     remove_original: bool = False,
+    zstd_threads: int = -1,
 ) -> str:
     """
     Compress a file using the specified algorithm.
@@ -65,6 +120,7 @@ def compress_file(
         algorithm: Compression algorithm ('gzip', 'zstd', 'lz4')
         level: Compression level (1-9 for gzip, 1-22 for zstd, 1-12 for lz4)
         remove_original: Whether to delete original file after compression
+        zstd_threads: zstd worker threads (-1: one per CPU, 0: single-threaded)
 
     Returns:
         Path to compressed file
@@ -77,55 +133,104 @@ def compress_file(
         raise FileNotFoundError(f"File not found: {file_path}")
 
     algorithm = algorithm.lower()
+    _check_algorithm(algorithm)
+
+    compressed_path = f"{file_path}{COMPRESSED_SUFFIXES[algorithm]}"
+    try:
+        with open(file_path, "rb") as f_in, open(compressed_path, "wb") as f_out:
+            compress_stream(f_in, f_out, algorithm, level, zstd_threads)
+    except Exception as e:
+        if os.path.exists(compressed_path):
+            os.remove(compressed_path)
+        if isinstance(e, CompressionError):
+            raise
+        raise CompressionError(f"{algorithm} compression failed: {e}")
+
+    # Remove original if requested
+    if remove_original and os.path.exists(compressed_path):
+        os.remove(file_path)
+
+    return compressed_path
+
+
+def compress_stream(
+    f_in: io.BufferedReader,
+    f_out: Any,
+    algorithm: str = "gzip",
+    level: int = 6,
+    zstd_threads: int = -1,
+) -> None:
+    """
+    Compress the file f_in into f_out, any binary writer.
+
+    f_out may be another stage of a pipeline (e.g. an encrypting writer), so
+    compressed data never has to touch disk on its own. It is left open.
+
+    Args:
+        f_in: Source file, opened for binary reading
+        f_out: Destination with a write() method
+        algorithm: Compression algorithm ('gzip', 'zstd', 'lz4')
+        level: Compression level (1-9 for gzip, 1-22 for zstd, 1-12 for lz4)
+        zstd_threads: zstd worker threads (-1: one per CPU, 0: single-threaded)
+
+    Raises:
+        CompressionError: If compression fails
+        ValueError: If algorithm is not supported
+    """
+    algorithm = algorithm.lower()
+    _check_algorithm(algorithm)
+    _read_sequentially(f_in)
 
     if algorithm == "gzip":
-        compressed_path = f"{file_path}.gz"
         try:
-            with open(file_path, "rb") as f_in:
-                with gzip.open(compressed_path, "wb", compresslevel=level) as f_out:
-                    f_out.write(f_in.read())
+            with gzip.GzipFile(fileobj=f_out, mode="wb", compresslevel=level) as gz:
+                _streamed_copy(f_in, gz)
         except Exception as e:
             raise CompressionError(f"gzip compression failed: {e}")
 
     elif algorithm == "zstd":
-        if not ZSTD_AVAILABLE:
-            raise ValueError(
-                "zstd compression not available. Install: pip install zstandard"
-            )
-
-        compressed_path = f"{file_path}.zst"
         try:
-            with open(file_path, "rb") as f_in:
-                data = f_in.read()
-                cctx = zstd.ZstdCompressor(level=level)
-                compressed = cctx.compress(data)
-                with open(compressed_path, "wb") as f_out:
-                    f_out.write(compressed)
+            if zstd_threads < 0:
+                zstd_threads = os.cpu_count() or 1
+            # A lone worker thread only adds hand-off overhead
+            cctx = zstd.ZstdCompressor(
+                level=level, threads=zstd_threads if zstd_threads > 1 else 0
+            )
+            # Recording the size keeps the frame readable by one-shot
+            # decompress(), which older releases use to restore
+            cctx.copy_stream(
+                f_in,
+                f_out,
+                size=os.fstat(f_in.fileno()).st_size,
+                read_size=STREAM_CHUNK_SIZE,
+                write_size=STREAM_CHUNK_SIZE,
+            )
         except Exception as e:
             raise CompressionError(f"zstd compression failed: {e}")
 
-    elif algorithm == "lz4":
-        if not LZ4_AVAILABLE:
-            raise ValueError("lz4 compression not available. Install: pip install lz4")
-
-        compressed_path = f"{file_path}.lz4"
+    else:
         try:
-            with open(file_path, "rb") as f_in:
-                data = f_in.read()
-                compressed = lz4.frame.compress(data, compression_level=level)
-                with open(compressed_path, "wb") as f_out:
-                    f_out.write(compressed)
+            with lz4.frame.LZ4FrameFile(
+                f_out,
+                "wb",
+                compression_level=level,
+                block_size=lz4.frame.BLOCKSIZE_MAX4MB,
+            ) as lz:
+                _streamed_copy(f_in, lz)
         except Exception as e:
             raise CompressionError(f"lz4 compression failed: {e}")
 
-    else:
-        raise ValueError(f"Unsupported compression algorithm: {algorithm}")
-
-    # Remove original if requested
-    if remove_original and os.path.exists(compressed_path):
-        os.remove(file_path)
 
-    return compressed_path
+def _check_algorithm(algorithm: str) -> None:
+    """Raise ValueError unless algorithm is known and its library installed"""
+    if algorithm == "zstd" and not ZSTD_AVAILABLE:
+        raise ValueError(
+            "zstd compression not available. Install: pip install zstandard"
+        )
+    if algorithm == "lz4" and not LZ4_AVAILABLE:
+        raise ValueError("lz4 compression not available. Install: pip install lz4")
+    if algorithm not in COMPRESSED_SUFFIXES:
+        raise ValueError(f"Unsupported compression algorithm: {algorithm}")
 
 
 def decompress_file(
@@ -161,7 +266,7 @@ def decompress_file(
         try:
             with gzip.open(file_path, "rb") as f_in:
                 with open(output_path, "wb") as f_out:
-                    f_out.write(f_in.read())
+                    _streamed_copy(f_in, f_out)
         except Exception as e:
             raise CompressionError(f"gzip decompression failed: {e}")
 
@@ -172,12 +277,16 @@ def decompress_file(
             )
 
         try:
+            dctx = zstd.ZstdDecompressor()
             with open(file_path, "rb") as f_in:
-                compressed = f_in.read()
-                dctx = zstd.ZstdDecompressor()
-                decompressed = dctx.decompress(compressed)
+                _read_sequentially(f_in)
                 with open(output_path, "wb") as f_out:
-                    f_out.write(decompressed)
+                    dctx.copy_stream(
+                        f_in,
+                        f_out,
+                        read_size=STREAM_CHUNK_SIZE,
+                        write_size=STREAM_CHUNK_SIZE,
+                    )
         except Exception as e:
             raise CompressionError(f"zstd decompression failed: {e}")
 
@@ -188,11 +297,9 @@ def decompress_file(
             )
 
         try:
-            with open(file_path, "rb") as f_in:
-                compressed = f_in.read()
-                decompressed = lz4.frame.decompress(compressed)
+            with lz4.frame.open(file_path, "rb") as f_in:
                 with open(output_path, "wb") as f_out:
-                    f_out.write(decompressed)
+                    _streamed_copy(f_in, f_out)
         except Exception as e:
             raise CompressionError(f"lz4 decompression failed: {e}")
 
@@ -222,10 +329,13 @@ def get_compression_ratio(original_path: str, compressed_path: str) -> float:
     return compressed_size / original_size if original_size > 0 else 0
 
 
+@lru_cache(maxsize=1)
 def get_compression_info() -> dict:
     """
     Get information about available compression algorithms.
 
+    Cached like get_available_algorithms(); do not mutate the result.
+
     Returns:
         Dictionary with algorithm details
     """
@@ -3,16 +3,48 @@ Config Sync Module
 Handles automatic synchronization of config.json to S3
 """
 
-import json
+import hashlib
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, Optional, cast
 
 import logging
 
+from core.compression import ZSTD_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
+# The uploaded config is zstd-compressed when zstandard is installed; the frame
+# magic number tells the two formats apart on download
+CONFIG_ZSTD_LEVEL = 3
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """os.stat(path), or None if the file doesn't exist"""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+def _content_hash(*paths: str) -> str:
+    """BLAKE2b digest over the contents of paths, missing files counting as empty"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        # Length-prefix each file so content can't shift between them
+        hasher.update(len(data).to_bytes(8, "big"))
+        hasher.update(data)
+    return hasher.hexdigest()
+
 
 class ConfigSync:
     """
@@ -37,6 +69,21 @@ class ConfigSync:
         # Reverse-proxy config travels with the main config so a fresh restore
         # produces an identical deployment (same domain, ACME settings, routes).
         self.proxy_backup_key = "config/proxy.json"
+        # JWT signing secret, encrypted, so tokens survive a restore on a new host
+        self.jwt_secret_backup_key = "config/jwt.key"
+        # Provider for the sync target, reused while the target's settings stay
+        # the same so consecutive syncs share one client and connection pool
+        self._storage: Any = None
+        self._storage_key: Optional[tuple] = None
+
+    def _get_storage(self, target_id: int) -> Any:
+        """Get the storage provider for target_id, reusing the cached one"""
+        target_config = self.storage_manager.get_storage_config(target_id)
+        key = (target_id, dict(target_config) if target_config else None)
+        if self._storage is None or key != self._storage_key:
+            self._storage = self.storage_manager.get_storage(target_id)
+            self._storage_key = key
+        return self._storage
 
     def get_config_target_id(self) -> Optional[int]:
         """
@@ -81,14 +128,15 @@ class ConfigSync:
             return False
 
         try:
-            storage = self.storage_manager.get_storage(target_id)
+            storage = self._get_storage(target_id)
             if not storage:
                 if not silent:
                     logger.info("⚠️ Failed to get storage for config sync")
                 return False
 
             # Get config file path
-            from config import CONFIG_FILE
+            from config import CONFIG_FILE, JWT_SECRET_FILE, _dump_json
+            from utils.config_export import PROXY_CONFIG_FILE
 
             config_path = str(CONFIG_FILE)
 
@@ -97,34 +145,64 @@ class ConfigSync:
                     logger.info("⚠️ Config file not found")
                 return False
 
+            # Nothing to upload if the remote copy was synced from identical
+            # files: one HEAD instead of up to three PUTs
+            content_hash = _content_hash(
+                config_path, str(PROXY_CONFIG_FILE), str(JWT_SECRET_FILE)
+            )
+            remote_info = storage.get_file_info(self.config_backup_key) or {}
+            if (remote_info.get("metadata") or {}).get("content_hash") == content_hash:
+                if not silent:
+                    logger.info("✅ Config already in sync with storage")
+                return True
+
             # Create metadata
             metadata = {
                 "sync_time": datetime.now().isoformat(),
                 "hostname": os.uname().nodename if hasattr(os, "uname") else "unknown",
                 "version": "1.0",
+                "content_hash": content_hash,
             }
 
             # Upload config
-            if storage.upload_file(config_path, self.config_backup_key, metadata):
-                # Also upload metadata separately for easier access
-                metadata_str = json.dumps(metadata, indent=2)
-                temp_metadata = "/tmp/config_metadata.json"
-                with open(temp_metadata, "w") as f:
-                    f.write(metadata_str)
-                storage.upload_file(temp_metadata, self.config_metadata_key)
-                os.remove(temp_metadata)
+            if self._upload_config(storage, config_path, metadata):
+                # The metadata (uploaded separately for easier access) and the
+                # optional proxy.json and JWT secret siblings go up
+                # concurrently, each PUT waiting on its own round trip
+                with ThreadPoolExecutor(max_workers=3) as pool:
+                    metadata_upload = pool.submit(
+                        storage.upload_bytes,
+                        _dump_json(metadata),
+                        self.config_metadata_key,
+                    )
+                    proxy_upload = pool.submit(
+                        self._upload_proxy_config, storage, metadata
+                    )
+                    jwt_upload = pool.submit(self._upload_jwt_secret, storage, metadata)
 
-                # Best-effort upload of proxy.json (optional sibling file).
                 try:
-                    from utils.config_export import PROXY_CONFIG_FILE
+                    metadata_ok = bool(metadata_upload.result())
+                except Exception as e:
+                    if not silent:
+                        logger.info(f"⚠️ Config metadata upload failed: {e}")
+                    metadata_ok = False
 
-                    if PROXY_CONFIG_FILE.exists():
-                        storage.upload_file(
-                            str(PROXY_CONFIG_FILE), self.proxy_backup_key, metadata
-                        )
+                # Best-effort upload of proxy.json (optional sibling file).
+                try:
+                    proxy_upload.result()
                 except Exception as e:
                     if not silent:
                         logger.info(f"⚠️ proxy config upload skipped: {e}")
+                try:
+                    jwt_upload.result()
+                except Exception as e:
+                    if not silent:
+                        logger.info(f"⚠️ JWT secret upload skipped: {e}")
+
+                if not metadata_ok:
+                    if not silent:
+                        logger.info("⚠️ Failed to upload config metadata")
+                    return False
 
                 if not silent:
                     target_name = self.storage_manager.get_storage_name(target_id)
@@ -141,6 +219,94 @@ class ConfigSync:
                 logger.info(f"⚠️ Config sync failed: {e}")
             return False
 
+    def _upload_config(
+        self, storage: Any, config_path: str, metadata: Dict[str, Any]
+    ) -> bool:
+        """Upload config.json, zstd-compressed when zstandard is available"""
+        if not ZSTD_AVAILABLE:
+            return bool(
+                storage.upload_file(config_path, self.config_backup_key, metadata)
+            )
+
+        import zstandard
+
+        with open(config_path, "rb") as f:
+            payload = zstandard.ZstdCompressor(level=CONFIG_ZSTD_LEVEL).compress(
+                f.read()
+            )
+
+        return bool(
+            storage.upload_bytes(
+                payload,
+                self.config_backup_key,
+                {**metadata, "content_encoding": "zstd"},
+            )
+        )
+
+    def _upload_proxy_config(self, storage: Any, metadata: Dict[str, Any]) -> None:
+        """Upload proxy.json if this deployment has one"""
+        from utils.config_export import PROXY_CONFIG_FILE
+
+        if PROXY_CONFIG_FILE.exists():
+            storage.upload_file(str(PROXY_CONFIG_FILE), self.proxy_backup_key, metadata)
+
+    def _upload_jwt_secret(self, storage: Any, metadata: Dict[str, Any]) -> None:
+        """Upload the JWT secret, encrypted, if one was created"""
+        from utils.config_export import read_jwt_secret_token
+
+        token = read_jwt_secret_token(self.config_manager)
+        if token:
+            storage.upload_bytes(token.encode(), self.jwt_secret_backup_key, metadata)
+
+    def _download_jwt_secret(self, storage: Any) -> bool:
+        """Install the synced JWT secret; False if it can't be decrypted here"""
+        from utils.config_export import restore_jwt_secret_token
+
+        fd, temp_path = tempfile.mkstemp(suffix=".jwt.download")
+        os.close(fd)
+        try:
+            if not storage.download_file(self.jwt_secret_backup_key, temp_path):
+                return False
+            with open(temp_path, "r", encoding="utf-8") as f:
+                token = f.read()
+        finally:
+            os.remove(temp_path)
+        return restore_jwt_secret_token(self.config_manager, token)
+
+    def _download_config(self, storage: Any, local_config_path: str) -> bool:
+        """Download config.json, decompressing it if it was uploaded with zstd"""
+        return self._download_replacing(
+            storage, self.config_backup_key, local_config_path
+        )
+
+    def _download_replacing(
+        self, storage: Any, remote_key: str, local_path: str
+    ) -> bool:
+        """Download a synced file over local_path, decompressing zstd payloads"""
+        # Download next to the target and swap it in, so a failed transfer
+        # never clobbers the local file
+        fd, temp_path = tempfile.mkstemp(
+            suffix=".json.download", dir=os.path.dirname(local_path)
+        )
+        os.close(fd)
+        try:
+            if not storage.download_file(remote_key, temp_path):
+                return False
+
+            with open(temp_path, "rb") as f:
+                data = f.read()
+            if data[:4] == ZSTD_MAGIC:
+                import zstandard
+
+                with open(temp_path, "wb") as f:
+                    f.write(zstandard.ZstdDecompressor().decompress(data))
+
+            os.replace(temp_path, local_path)
+            return True
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
     def sync_from_storage(self, force: bool = False, interactive: bool = True) -> bool:
         """
         Download config.json from Storage
@@ -157,7 +323,7 @@ class ConfigSync:
             return False
 
         try:
-            storage = self.storage_manager.get_storage(target_id)
+            storage = self._get_storage(target_id)
             if not storage:
                 logger.info("⚠️ Failed to get storage for config sync")
                 return False
@@ -172,19 +338,15 @@ class ConfigSync:
 
             local_config_path = str(CONFIG_FILE)
 
+            local_stat = _stat_or_none(local_config_path)
+
             # Conflict resolution
-            # Conflict resolution
-            if os.path.exists(local_config_path) and not force:
-                local_mtime = datetime.fromtimestamp(
-                    os.path.getmtime(local_config_path)
-                )
+            if local_stat and not force:
                 remote_mtime = remote_config_info["last_modified"]
 
-                # Make both timezone-aware or both naive for comparison
-                if remote_mtime.tzinfo is not None:
-                    remote_mtime = remote_mtime.replace(tzinfo=None)
-
-                if local_mtime > remote_mtime:
+                # Compare POSIX timestamps: no timezone juggling needed
+                if local_stat.st_mtime > remote_mtime.timestamp():
+                    local_mtime = datetime.fromtimestamp(local_stat.st_mtime)
                     logger.info(
                         "ℹ️  Local config is newer "
                         f"(local: {local_mtime}, Remote: {remote_mtime})"
@@ -202,18 +364,30 @@ class ConfigSync:
                         return False
 
             # Backup local config before downloading
-            if os.path.exists(local_config_path):
+            backup_path = None
+            if local_stat:
                 backup_path = (
                     f"{local_config_path}.backup."
                     f"{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                 )
-                shutil.copy2(local_config_path, backup_path)
+                # A hard link copies nothing: the download swaps a new file in
+                # with os.replace, leaving the old inode to the backup alone
+                try:
+                    os.link(local_config_path, backup_path)
+                except OSError:
+                    shutil.copy2(local_config_path, backup_path)
                 logger.info(f"📋 Local config backed up to: {backup_path}")
 
             # Download from remote
-            if storage.download_file(self.config_backup_key, local_config_path):
+            if self._download_config(storage, local_config_path):
                 logger.info("✅ Config downloaded from storage")
 
+                # Give the local copy the remote's timestamp, so the next
+                # startup sees them as equal instead of comparing against the
+                # download time
+                remote_ts = remote_config_info["last_modified"].timestamp()
+                os.utime(local_config_path, (remote_ts, remote_ts))
+
                 # Reload config in memory
                 self.config_manager.config = self.config_manager._load_config()
 
@@ -221,15 +395,34 @@ class ConfigSync:
                 try:
                     from utils.config_export import PROXY_CONFIG_FILE
 
-                    if storage.get_file_info(self.proxy_backup_key):
-                        storage.download_file(
-                            self.proxy_backup_key, str(PROXY_CONFIG_FILE)
-                        )
+                    key = self.proxy_backup_key
+                    if storage.get_file_info(key) and self._download_replacing(
+                        storage, key, str(PROXY_CONFIG_FILE)
+                    ):
                         logger.info("✅ Proxy config downloaded from storage")
                 except Exception as e:
                     logger.info(f"ℹ️  proxy config not synced: {e}")
+
+                # Best-effort download of the JWT secret, so tokens issued by
+                # the uploading host stay valid here (after an API restart)
+                try:
+                    key = self.jwt_secret_backup_key
+                    if storage.get_file_info(key):
+                        if self._download_jwt_secret(storage):
+                            logger.info("✅ JWT secret downloaded from storage")
+                        else:
+                            logger.info(
+                                "ℹ️  JWT secret not synced: it was encrypted "
+                                "with a different master key"
+                            )
+                except Exception as e:
+                    logger.info(f"ℹ️  JWT secret not synced: {e}")
                 return True
             else:
+                # The local config is untouched, and a linked backup would keep
+                # sharing its inode with it
+                if backup_path:
+                    os.remove(backup_path)
                 logger.info("⚠️ Failed to download config from storage")
                 return False
 
@@ -249,7 +442,7 @@ class ConfigSync:
             return None
 
         try:
-            storage = self.storage_manager.get_storage(target_id)
+            storage = self._get_storage(target_id)
             if not storage:
                 return None
 
@@ -277,15 +470,10 @@ class ConfigSync:
 
         local_config_path = str(CONFIG_FILE)
 
-        if os.path.exists(local_config_path):
-            local_mtime = datetime.fromtimestamp(os.path.getmtime(local_config_path))
-            remote_mtime = remote_info["last_modified"]
-
-            # Make both timezone-aware or both naive
-            if remote_mtime.tzinfo is not None:
-                remote_mtime = remote_mtime.replace(tzinfo=None)
-
-            if remote_mtime > local_mtime:
+        local_stat = _stat_or_none(local_config_path)
+        if local_stat:
+            # Compare POSIX timestamps: no timezone juggling needed
+            if remote_info["last_modified"].timestamp() > local_stat.st_mtime:
                 logger.info("📥 Remote config is newer - downloading...")
                 self.sync_from_storage(force=True)
             else:
@@ -1,24 +1,35 @@
 import sys
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 import os
-from crontab import CronTab
+
+if TYPE_CHECKING:
+    from crontab import CronTab
 
 PYTHON_EXEC = sys.executable
 # main.py lives at the repo root relative to this file.
 MAIN_SCRIPT = str(Path(__file__).resolve().parent.parent / "main.py")
+# Comment tagging our crontab entries, followed by the database id
+JOB_COMMENT_PREFIX = "dbmanager-backup:"
 
 
 class CronManager:
-    def __init__(self) -> None:
-        self.cron = CronTab(user=True)
+    @cached_property
+    def cron(self) -> "CronTab":
+        # Loaded on first use: reading the crontab runs `crontab -l`, which
+        # the CLI and API would otherwise pay for at import time
+        from crontab import CronTab
+
+        return CronTab(user=True)
 
     def list_jobs(self) -> List[Dict[str, Any]]:
         jobs = []
         for job in self.cron:
-            if "dbmanager-backup" in job.comment:
-                db_id = job.comment.split(":")[-1]
+            comment = job.comment
+            if comment.startswith(JOB_COMMENT_PREFIX):
+                db_id = comment[len(JOB_COMMENT_PREFIX) :]
                 jobs.append(
                     {
                         "id": db_id,
@@ -30,8 +41,9 @@ class CronManager:
         return jobs
 
     def add_backup_job(self, db_id: int, schedule: str = "0 0 * * *") -> bool:
-        # Remove existing job for this db
-        self.remove_job(db_id)
+        # Remove existing job for this db; written out with the new one below,
+        # so the crontab is rewritten once
+        self.cron.remove_all(comment=f"{JOB_COMMENT_PREFIX}{db_id}")
 
         # Pass DBMANAGER_DATA_DIR explicitly if set in the environment.
 
@@ -45,21 +57,21 @@ class CronManager:
             f"{env_prefix}{PYTHON_EXEC} {MAIN_SCRIPT} perform-backup --db-id {db_id}"
         )
 
-        job = self.cron.new(command=command, comment=f"dbmanager-backup:{db_id}")
+        job = self.cron.new(command=command, comment=f"{JOB_COMMENT_PREFIX}{db_id}")
         job.setall(schedule)
         self.cron.write()
         return True
 
     def update_schedule(self, db_id: int, schedule: str) -> bool:
         """Update schedule for an existing job (or create if missing)."""
-        self.remove_job(db_id)
+        # add_backup_job replaces any existing job in a single write
         return self.add_backup_job(db_id, schedule)
 
     def set_job_enabled(self, db_id: int, enabled: bool) -> bool:
         """Enable or disable a job by db_id."""
         updated = False
         for job in self.cron:
-            if job.comment == f"dbmanager-backup:{db_id}":
+            if job.comment == f"{JOB_COMMENT_PREFIX}{db_id}":
                 if enabled:
                     job.enable(True)
                 else:
@@ -70,5 +82,5 @@ class CronManager:
         return updated
 
     def remove_job(self, db_id: int) -> None:
-        self.cron.remove_all(comment=f"dbmanager-backup:{db_id}")
+        self.cron.remove_all(comment=f"{JOB_COMMENT_PREFIX}{db_id}")
         self.cron.write()
@@ -4,18 +4,36 @@ Provides secure encryption/decryption for database backups.
 Uses AES-256 in GCM mode for authenticated encryption.
 """
 
+import importlib.util
+import mmap
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Optional
+
+from core.buffer_pool import buffer_pool
+
+# cryptography's primitives are imported where they're used: commands that
+# never encrypt skip loading them, so only check that the package exists
+ENCRYPTION_AVAILABLE = importlib.util.find_spec("cryptography") is not None
 
-try:
-    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
-    ENCRYPTION_AVAILABLE = True
-except ImportError:
-    ENCRYPTION_AVAILABLE = False
+# Files are encrypted and decrypted in chunks of this size, so memory use
+# stays flat regardless of backup size
+ENCRYPTION_CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are encrypted straight out of a read-only memory
+# map, skipping the copy into a userspace buffer for every chunk
+ENCRYPTION_MMAP_MIN_BYTES = 16 * ENCRYPTION_CHUNK_SIZE
+
+# update_into() needs this much room past the input size in its output buffer
+# (one AES block, less a byte)
+CIPHER_OVERHEAD = 15
+
+# On-disk layout: salt | nonce | ciphertext | GCM tag
+SALT_SIZE = 16
+NONCE_SIZE = 12
+TAG_SIZE = 16
 
 
 class EncryptionError(Exception):
@@ -45,6 +63,11 @@ def derive_key_from_password(password: str, salt: bytes) -> bytes:
             "Encryption not available. Install: pip install cryptography"
         )
 
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    # Not cached: a process-wide cache would keep passwords and keys in
+    # memory for good. BatchEncryptor derives once per backup run instead.
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,  # 256 bits
@@ -84,35 +107,180 @@ def encrypt_file(file_path: str, password: str, remove_original: bool = False) -
         raise FileNotFoundError(f"File not found: {file_path}")
 
     # Generate random salt and nonce
-    salt = os.urandom(16)  # 128 bits
-    nonce = os.urandom(12)  # 96 bits (recommended for GCM)
+    salt = os.urandom(SALT_SIZE)  # 128 bits
+    nonce = os.urandom(NONCE_SIZE)  # 96 bits (recommended for GCM)
 
     # Derive key from password
     key = derive_key_from_password(password, salt)
 
-    # Read plaintext
-    try:
-        with open(file_path, "rb") as f:
-            plaintext = f.read()
-    except Exception as e:
-        raise EncryptionError(f"Failed to read file: {e}")
+    return _encrypt_with_key(file_path, key, salt, nonce, remove_original)
 
-    # Encrypt with AES-GCM
-    try:
-        aesgcm = AESGCM(key)
-        ciphertext = aesgcm.encrypt(nonce, plaintext, None)
-    except Exception as e:
-        raise EncryptionError(f"Encryption failed: {e}")
 
-    # Write encrypted file
+class BatchEncryptor:
+    """
+    Encrypt several files under one password with a single key derivation.
+
+    One random salt (and so one PBKDF2 run) serves the whole session; each file
+    gets the next value of a 96-bit counter as its GCM nonce, so no nonce is
+    reused under the session key. Output is identical in layout to
+    encrypt_file(), so decrypt_file() reads it unchanged. Safe to share
+    between threads.
+    """
+
+    def __init__(self, password: str) -> None:
+        self._salt = os.urandom(SALT_SIZE)
+        self._key = derive_key_from_password(password, self._salt)
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _next_nonce(self) -> bytes:
+        with self._lock:
+            if self._counter >= 1 << (8 * NONCE_SIZE):
+                raise EncryptionError("Nonce space exhausted for this session")
+            nonce = self._counter.to_bytes(NONCE_SIZE, "big")
+            self._counter += 1
+        return nonce
+
+    def encrypt_file(self, file_path: str, remove_original: bool = False) -> str:
+        """Encrypt file_path like encrypt_file(), with the session key"""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        return _encrypt_with_key(
+            file_path, self._key, self._salt, self._next_nonce(), remove_original
+        )
+
+    def open(self, encrypted_path: str) -> "EncryptedWriter":
+        """Writer for encrypted_path like open_encrypted(), with the session key"""
+        return EncryptedWriter(
+            encrypted_path, self._key, self._salt, self._next_nonce()
+        )
+
+
+def open_encrypted(encrypted_path: str, password: str) -> "EncryptedWriter":
+    """
+    Open encrypted_path as a writer whose plaintext is encrypted on the way out.
+
+    Produces the same file as encrypt_file() would for the bytes written, so
+    a pipeline (e.g. a compressor) can feed it without a plaintext file on
+    disk. The data is only complete once the writer is closed cleanly.
+
+    Args:
+        encrypted_path: Path of the encrypted file to create
+        password: Encryption password
+
+    Returns:
+        EncryptedWriter, usable as a context manager
+
+    Raises:
+        EncryptionError: If encryption is not available
+    """
+    if not ENCRYPTION_AVAILABLE:
+        raise EncryptionError(
+            "Encryption not available. Install: pip install cryptography"
+        )
+
+    salt = os.urandom(SALT_SIZE)
+    key = derive_key_from_password(password, salt)
+    return EncryptedWriter(encrypted_path, key, salt, os.urandom(NONCE_SIZE))
+
+
+class EncryptedWriter:
+    """Binary writer that AES-GCM encrypts into a file laid out as encrypt_file()'s"""
+
+    def __init__(self, path: str, key: bytes, salt: bytes, nonce: bytes) -> None:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        self._encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        self._f = open(path, "wb")
+        try:
+            self._f.write(salt)
+            self._f.write(nonce)
+        except BaseException:
+            self._f.close()
+            raise
+        # Taken last, once nothing left in __init__ can fail and leak it
+        self._out_buf = buffer_pool.acquire(ENCRYPTION_CHUNK_SIZE + CIPHER_OVERHEAD)
+        self._out = memoryview(self._out_buf)
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        for offset in range(0, len(view), ENCRYPTION_CHUNK_SIZE):
+            _update_into(
+                self._encryptor,
+                view[offset : offset + ENCRYPTION_CHUNK_SIZE],
+                self._out,
+                self._f,
+            )
+        return len(view)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        """Finish the ciphertext, append the GCM tag and close the file"""
+        if self._f.closed:
+            return
+        try:
+            self._f.write(self._encryptor.finalize())
+            self._f.write(self._encryptor.tag)
+        finally:
+            self._close_file()
+
+    def _close_file(self) -> None:
+        # Runs once: a with block that raises after close() lands here again,
+        # and releasing the buffer twice would hand it to two acquirers
+        if self._f.closed:
+            return
+        try:
+            self._f.close()
+        finally:
+            buffer_pool.release(self._out_buf)
+
+    def __enter__(self) -> "EncryptedWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave the file truncated and tagless; the caller discards it
+            self._close_file()
+
+
+def _encrypt_with_key(
+    file_path: str, key: bytes, salt: bytes, nonce: bytes, remove_original: bool
+) -> str:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    # Encrypt with AES-GCM, streaming; the layout matches one-shot AESGCM
+    # output, so files from either path decrypt the same way
     encrypted_path = f"{file_path}.enc"
     try:
-        with open(encrypted_path, "wb") as f:
-            f.write(salt)  # 16 bytes
-            f.write(nonce)  # 12 bytes
-            f.write(ciphertext)  # encrypted data + auth tag
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        # One input and one output buffer serve every chunk
+        with (
+            open(file_path, "rb") as f_in,
+            open(encrypted_path, "wb") as f_out,
+            buffer_pool.borrow(ENCRYPTION_CHUNK_SIZE + CIPHER_OVERHEAD) as out_buf,
+        ):
+            f_out.write(salt)  # 16 bytes
+            f_out.write(nonce)  # 12 bytes
+            out = memoryview(out_buf)
+            # Files that can't be mapped fall back to plain reads
+            if os.fstat(f_in.fileno()).st_size < ENCRYPTION_MMAP_MIN_BYTES or (
+                not _encrypt_mapped(f_in, f_out, encryptor, out)
+            ):
+                with buffer_pool.borrow(ENCRYPTION_CHUNK_SIZE) as in_buf:
+                    buf = memoryview(in_buf)
+                    while n := f_in.readinto(buf):
+                        _update_into(encryptor, buf[:n], out, f_out)
+            f_out.write(encryptor.finalize())
+            f_out.write(encryptor.tag)  # 16 bytes
     except Exception as e:
-        raise EncryptionError(f"Failed to write encrypted file: {e}")
+        if os.path.exists(encrypted_path):
+            os.remove(encrypted_path)
+        raise EncryptionError(f"Encryption failed: {e}")
 
     # Remove original if requested
     if remove_original and os.path.exists(encrypted_path):
@@ -121,6 +289,31 @@ def encrypt_file(file_path: str, password: str, remove_original: bool = False) -
     return encrypted_path
 
 
+def _update_into(context: Any, data: memoryview, out: memoryview, f_out: Any) -> None:
+    """Run data through a cipher context into out and write the result"""
+    f_out.write(out[: context.update_into(data, out)])
+
+
+def _encrypt_mapped(
+    f_in: BinaryIO, f_out: BinaryIO, encryptor: Any, out: memoryview
+) -> bool:
+    """Feed f_in through encryptor from a memory map; False if it can't be mapped"""
+    try:
+        mapped = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+
+    with mapped:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mapped) as view:
+            for offset in range(0, len(view), ENCRYPTION_CHUNK_SIZE):
+                _update_into(
+                    encryptor, view[offset : offset + ENCRYPTION_CHUNK_SIZE], out, f_out
+                )
+    return True
+
+
 def decrypt_file(
     file_path: str,
     password: str,
@@ -150,18 +343,30 @@ def decrypt_file(
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Read encrypted file
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    # Read header and trailing tag
     try:
+        ciphertext_size = os.path.getsize(file_path) - SALT_SIZE - NONCE_SIZE
         with open(file_path, "rb") as f:
-            salt = f.read(16)  # 16 bytes
-            nonce = f.read(12)  # 12 bytes
-            ciphertext = f.read()  # rest of file
+            salt = f.read(SALT_SIZE)
+            nonce = f.read(NONCE_SIZE)
+            if ciphertext_size >= TAG_SIZE:
+                f.seek(-TAG_SIZE, os.SEEK_END)
+                tag = f.read(TAG_SIZE)
     except Exception as e:
         raise EncryptionError(f"Failed to read encrypted file: {e}")
 
     # Validate file format
-    if len(salt) != 16 or len(nonce) != 12:
+    if len(salt) != SALT_SIZE or len(nonce) != NONCE_SIZE:
         raise EncryptionError("Invalid encrypted file format")
+    if ciphertext_size < TAG_SIZE:
+        raise EncryptionError(
+            "Decryption failed (wrong password or corrupted file): "
+            "authentication tag missing"
+        )
+    ciphertext_size -= TAG_SIZE
 
     # Derive key from password
     try:
@@ -169,15 +374,6 @@ def decrypt_file(
     except Exception as e:
         raise EncryptionError(f"Key derivation failed: {e}")
 
-    # Decrypt with AES-GCM
-    try:
-        aesgcm = AESGCM(key)
-        plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-    except Exception as e:
-        raise EncryptionError(
-            f"Decryption failed (wrong password or corrupted file): {e}"
-        )
-
     # Determine output path
     if output_path is None:
         # Remove .enc extension
@@ -187,12 +383,38 @@ def decrypt_file(
         else:
             output_path = f"{file_path}.dec"
 
-    # Write decrypted file
+    # Decrypt with AES-GCM, streaming. Plaintext reaches disk before the tag
+    # is checked at the end, so the output is removed if that check fails.
     try:
-        with open(output_path, "wb") as f:
-            f.write(plaintext)
+        decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, tag)).decryptor()
+        # Read into and decrypt out of buffers reused for every chunk
+        with (
+            open(file_path, "rb") as f_in,
+            open(output_path, "wb") as f_out,
+            buffer_pool.borrow(ENCRYPTION_CHUNK_SIZE) as in_buf,
+            buffer_pool.borrow(ENCRYPTION_CHUNK_SIZE + CIPHER_OVERHEAD) as out_buf,
+        ):
+            buf = memoryview(in_buf)
+            out = memoryview(out_buf)
+            f_in.seek(SALT_SIZE + NONCE_SIZE)
+            remaining = ciphertext_size
+            while remaining:
+                n = f_in.readinto(buf[: min(ENCRYPTION_CHUNK_SIZE, remaining)])
+                if not n:
+                    raise EncryptionError("Encrypted file truncated while reading")
+                remaining -= n
+                _update_into(decryptor, buf[:n], out, f_out)
+            f_out.write(decryptor.finalize())
+    except InvalidTag:
+        os.remove(output_path)
+        raise EncryptionError(
+            "Decryption failed (wrong password or corrupted file): "
+            "authentication tag mismatch"
+        )
     except Exception as e:
-        raise EncryptionError(f"Failed to write decrypted file: {e}")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise EncryptionError(f"Failed to decrypt file: {e}")
 
     # Remove encrypted file if requested
     if remove_encrypted and os.path.exists(output_path):
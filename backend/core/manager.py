@@ -1,9 +1,12 @@
+import heapq
 import json
 import logging
 import os
+import shutil
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 from config import ConfigManager, CONFIG_DIR
 from .providers.base import BaseProvider
@@ -41,10 +44,21 @@ from .providers.sqlserver import SQLServerProvider
 from .providers.mongodb import MongoDBProvider
 from .providers.mariadb import MariaDBProvider
 from .storage_manager import StorageManager
-from .backup_utils import save_checksum, verify_backup, verify_checksum
-
-from .compression import compress_file
-from .encryption import encrypt_file
+from .backup_utils import (
+    HashingWriter,
+    save_checksum,
+    verify_backup,
+    verify_checksum,
+    write_checksum,
+)
+
+from .compression import (
+    COMPRESSED_SUFFIXES,
+    STREAM_CHUNK_SIZE,
+    compress_file,
+    compress_stream,
+)
+from .encryption import BatchEncryptor, encrypt_file, open_encrypted
 from .notifications import NotificationManager
 from .progress import ProgressStatus
 
@@ -55,6 +69,26 @@ if TYPE_CHECKING:
 BACKUP_ROOT = CONFIG_DIR / "backups"
 
 
+class _SafeNameTable(Dict[int, Optional[int]]):
+    """str.translate table keeping alphanumerics, '-' and '_'.
+
+    Filled lazily, one entry per distinct character seen, so the Unicode
+    isalnum() rules (and with them existing backup dir names) are kept while
+    translate() runs in C once a character has been seen.
+    """
+
+    def __missing__(self, code: int) -> Optional[int]:
+        char = chr(code)
+        kept = code if char.isalnum() or char in ("-", "_") else None
+        self[code] = kept
+        return kept
+
+
+_SAFE_NAME_TABLE = _SafeNameTable()
+# Backup formats listed by list_backups (including compressed/encrypted variants)
+BACKUP_SUFFIXES = (".sql", ".dump", ".bak", ".gz", ".enc", ".zst", ".lz4")
+
+
 class DBManager:
     def __init__(self) -> None:
         self.config_manager = ConfigManager()
@@ -96,8 +130,11 @@ class DBManager:
     def list_databases(self) -> List[Dict[str, Any]]:
         return self.config_manager.get_databases()
 
-    def get_provider_instance(self, db_id: int) -> BaseProvider:
-        db_config = self.config_manager.get_database(db_id)
+    def get_provider_instance(
+        self, db_id: int, db_config: Optional[Dict[str, Any]] = None
+    ) -> BaseProvider:
+        if db_config is None:
+            db_config = self.config_manager.get_database(db_id)
         if not db_config:
             raise ValueError(f"Database with ID {db_id} not found.")
 
@@ -214,15 +251,16 @@ class DBManager:
 
         return result
 
-    def _get_backup_dir(self, db_id: int) -> Path:
-        db_config = self.config_manager.get_database(db_id)
+    def _get_backup_dir(
+        self, db_id: int, db_config: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        if db_config is None:
+            db_config = self.config_manager.get_database(db_id)
         if not db_config:
             raise ValueError(f"Database {db_id} not found")
 
         # Folder name: id_name (sanitized)
-        safe_name = "".join(
-            [c for c in db_config["name"] if c.isalnum() or c in ("-", "_")]
-        )
+        safe_name = db_config["name"].translate(_SAFE_NAME_TABLE)
         return BACKUP_ROOT / f"{db_id}_{safe_name}"
 
     def backup_database(
@@ -230,12 +268,14 @@ class DBManager:
         db_id: int,
         tag: Optional[str] = None,
         progress: Optional["BackupProgress"] = None,
+        encryptor: Optional[BatchEncryptor] = None,
     ) -> str:
         db_config = self.config_manager.get_database(db_id)
         if db_config is None:
             raise ValueError(f"Database {db_id} not found")
-        provider = self.get_provider_instance(db_id)
-        backup_dir = self._get_backup_dir(db_id)
+        # Resolved once above; the helpers would each look it up again
+        provider = self.get_provider_instance(db_id, db_config)
+        backup_dir = self._get_backup_dir(db_id, db_config)
 
         if progress and progress.status == ProgressStatus.IDLE:
             progress.start(f"Starting backup for {db_config.get('name', db_id)}")
@@ -275,21 +315,56 @@ class DBManager:
             except Exception as e:
                 logger.info(f"⚠️  Failed to tag backup: {e}")
 
-        # Generate checksum for backup integrity
-        try:
-            checksum_file = save_checksum(path)
-            logger.info(f"✅ Checksum generated: {os.path.basename(checksum_file)}")
-        except Exception as e:
-            logger.info(f"⚠️  Checksum generation failed: {e}")
-            checksum_file = None
-
-        # Compress backup if enabled
         compression_settings = self.config_manager.get_compression_settings()
-        if compression_settings.get("enabled", False):
+        compress = compression_settings.get("enabled", False)
+        algorithm = compression_settings.get("algorithm", "gzip")
+        level = compression_settings.get("level", 6)
+
+        encryption_settings = self.config_manager.get_encryption_settings()
+        encrypt = encryption_settings.get("enabled", False)
+        password: str = encryption_settings.get("password") or ""
+        if encrypt and not password:
+            logger.info(
+                "⚠️  Encryption enabled but no password set, " "skipping encryption"
+            )
+            encrypt = False
+
+        checksum_file: Optional[str] = None
+
+        # Compress and/or encrypt in one pass that also takes the checksum,
+        # so neither the dump nor a compressed copy is read back from disk;
+        # staged below if this fails
+        if compress or encrypt:
             try:
-                algorithm = compression_settings.get("algorithm", "gzip")
-                level = compression_settings.get("level", 6)
+                original_size = os.path.getsize(path)
+                path, checksum_file = self._write_hashed(
+                    path,
+                    algorithm if compress else None,
+                    level,
+                    password if encrypt else None,
+                    encryptor if encrypt else None,
+                )
+                if compress and original_size:
+                    ratio = os.path.getsize(path) / original_size
+                    logger.info(
+                        f"✅ Compressed with {algorithm} (level {level}): "
+                        f"{ratio:.2%} of original"
+                    )
+                if encrypt:
+                    logger.info("✅ Encrypted")
+                logger.info(f"✅ Checksum generated: {os.path.basename(checksum_file)}")
+                compress = encrypt = False
+            except Exception as e:
+                logger.info(f"⚠️  Streaming compression/encryption failed: {e}")
+
+        # Generate checksum for backup integrity (of the compressed file, when
+        # compressing, as hashing the dump would be thrown away)
+        if not compress and checksum_file is None:
+            checksum_file = self._save_checksum_logged(path)
 
+        # Compress backup if enabled
+        if compress:
+            try:
                 logger.info(f"🗜️  Compressing with {algorithm} (level {level})...")
                 original_size = os.path.getsize(path)
                 compressed_path = compress_file(
@@ -299,14 +374,6 @@ class DBManager:
                 # Update path to compressed file
                 path = compressed_path
 
-                # Update checksum file reference
-                if checksum_file:
-                    try:
-                        Path(checksum_file).unlink(missing_ok=True)
-                    except Exception:
-                        pass
-                    checksum_file = save_checksum(compressed_path)
-
                 if original_size:
                     ratio = os.path.getsize(compressed_path) / original_size
                     logger.info(
@@ -317,37 +384,35 @@ class DBManager:
                     logger.info(f"✅ Compressed: {os.path.basename(compressed_path)}")
             except Exception as e:
                 logger.info(f"⚠️  Compression failed: {e}, using uncompressed backup")
+            checksum_file = self._save_checksum_logged(path)
 
         # Encrypt backup if enabled
-        encryption_settings = self.config_manager.get_encryption_settings()
-        if encryption_settings.get("enabled", False):
-            password = encryption_settings.get("password")
-            if not password:
-                logger.info(
-                    "⚠️  Encryption enabled but no password set, " "skipping encryption"
-                )
-            else:
-                try:
-                    logger.info("🔐 Encrypting backup...")
+        if encrypt:
+            try:
+                logger.info("🔐 Encrypting backup...")
+                # A batch run shares one key derivation across databases
+                if encryptor is not None:
+                    encrypted_path = encryptor.encrypt_file(path, remove_original=True)
+                else:
                     encrypted_path = encrypt_file(path, password, remove_original=True)
 
-                    # Update path to encrypted file
-                    path = encrypted_path
-
-                    # Update checksum file reference
-                    if checksum_file:
-                        # Rename checksum file to match encrypted file
-                        old_checksum = checksum_file
-                        checksum_file = f"{encrypted_path}.sha256"
-                        try:
-                            os.rename(old_checksum, checksum_file)
-                        except Exception:
-                            # If rename fails, regenerate checksum for encrypted file
-                            checksum_file = save_checksum(encrypted_path)
-
-                    logger.info(f"✅ Encrypted: {os.path.basename(encrypted_path)}")
-                except Exception as e:
-                    logger.info(f"⚠️  Encryption failed: {e}, using unencrypted backup")
+                # Update path to encrypted file
+                path = encrypted_path
+
+                # Update checksum file reference
+                if checksum_file:
+                    # Rename checksum file to match encrypted file
+                    old_checksum = checksum_file
+                    checksum_file = f"{encrypted_path}.sha256"
+                    try:
+                        os.rename(old_checksum, checksum_file)
+                    except Exception:
+                        # If rename fails, regenerate checksum for encrypted file
+                        checksum_file = save_checksum(encrypted_path)
+
+                logger.info(f"✅ Encrypted: {os.path.basename(encrypted_path)}")
+            except Exception as e:
+                logger.info(f"⚠️  Encryption failed: {e}, using unencrypted backup")
 
         # Upload to Storage targets (supports multiple)
         # New field: storage_target_ids (list of ints)
@@ -422,10 +487,83 @@ class DBManager:
 
         return path
 
+    def _save_checksum_logged(self, path: str) -> Optional[str]:
+        """save_checksum(path), logging the outcome; None if it failed"""
+        try:
+            checksum_file = save_checksum(path)
+            logger.info(f"✅ Checksum generated: {os.path.basename(checksum_file)}")
+            return checksum_file
+        except Exception as e:
+            logger.info(f"⚠️  Checksum generation failed: {e}")
+            return None
+
+    def _write_hashed(
+        self,
+        path: str,
+        algorithm: Optional[str],
+        level: int,
+        password: Optional[str],
+        encryptor: Optional[BatchEncryptor],
+    ) -> Tuple[str, str]:
+        """
+        Compress and/or encrypt a dump in a single streaming pass, hashing it
+        on the way through.
+
+        The result matches compress_file() and/or encrypt_file() followed by
+        save_checksum(): the checksum file holds the digest of the compressed
+        (or raw) stream, recorded under the unencrypted file's name. The dump
+        is removed on success.
+
+        Args:
+            path: Dump to process
+            algorithm: Compression algorithm, or None to store the dump as is
+            level: Compression level
+            password: Encryption password, or None not to encrypt
+            encryptor: Batch session to encrypt with instead of password
+
+        Returns:
+            (output file path, checksum file path)
+        """
+        plain_path = path
+        if algorithm:
+            plain_path += COMPRESSED_SUFFIXES[algorithm.lower()]
+        if encryptor is not None:
+            output_path = f"{plain_path}.enc"
+            f_out: Any = encryptor.open(output_path)
+        elif password is not None:
+            output_path = f"{plain_path}.enc"
+            f_out = open_encrypted(output_path, password)
+        else:
+            output_path = plain_path
+            f_out = open(output_path, "wb")
+        try:
+            with f_out, open(path, "rb") as f_in:
+                hashing = HashingWriter(f_out)
+                if algorithm:
+                    compress_stream(f_in, hashing, algorithm, level)
+                else:
+                    shutil.copyfileobj(f_in, hashing, STREAM_CHUNK_SIZE)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        checksum_file = write_checksum(
+            output_path, hashing.hexdigest(), filename=os.path.basename(plain_path)
+        )
+        os.remove(path)
+        return output_path, checksum_file
+
     def _enforce_retention(self, db_id: int, keep_last: int) -> None:
-        backups = self.list_backups(db_id)  # already sorted desc
+        # Local files only: listing S3 here would cost a request for nothing
+        backups = self._list_local_backups(db_id)
         if len(backups) > keep_last:
-            to_delete = backups[keep_last:]
+            # Only the newest keep_last matter; no need to sort the rest
+            keep = {
+                id(b)
+                for b in heapq.nlargest(keep_last, backups, key=itemgetter("date"))
+            }
+            to_delete = [b for b in backups if id(b) not in keep]
             for b in to_delete:
                 meta = self.config_manager.get_backup_metadata(b["filename"])
                 if meta.get("starred", False):
@@ -455,66 +593,75 @@ class DBManager:
             prefix = f"backups/{db_id}/"
             s3_backups = storage.list_files(prefix)
 
-            # Sort by last_modified descending
-            s3_backups = sorted(
-                s3_backups, key=lambda x: x["last_modified"], reverse=True
-            )
-
-            # Delete old backups
+            # Delete old backups, keeping the keep_last most recent
             if len(s3_backups) > keep_last:
-                to_delete = s3_backups[keep_last:]
+                keep = {
+                    id(b)
+                    for b in heapq.nlargest(
+                        keep_last, s3_backups, key=itemgetter("last_modified")
+                    )
+                }
+                to_delete = [b for b in s3_backups if id(b) not in keep]
+                # Backup and checksum keys, deduplicated but in order
+                keys: Dict[str, None] = {}
                 for backup in to_delete:
                     filename = backup["key"].split("/")[-1]
                     meta = self.config_manager.get_backup_metadata(filename)
                     if meta.get("starred", False):
                         continue
-                    try:
-                        storage.delete_file(backup["key"])
-                        storage.delete_file(f"{backup['key']}.sha256")
-                        logger.info(f"🗑️ Deleted old S3 backup: {backup['key']}")
-                    except Exception as e:
-                        logger.info(f"⚠️ Failed to delete S3 backup {backup['key']}: {e}")
+                    keys[backup["key"]] = None
+                    keys[f"{backup['key']}.sha256"] = None
+
+                # One batched request per 1000 keys instead of two per backup
+                failed = set(storage.delete_files(list(keys)))
+                for key in keys:
+                    if key.endswith(".sha256"):
+                        continue
+                    if key in failed:
+                        logger.info(f"⚠️ Failed to delete S3 backup {key}")
+                    else:
+                        logger.info(f"🗑️ Deleted old S3 backup: {key}")
         except Exception as e:
             logger.info(f"⚠️ S3 retention cleanup failed: {e}")
 
-    def list_backups(self, db_id: int) -> List[Dict[str, Any]]:
-        backups = []
-
-        # 1. LOCAL BACKUPS
+    def _list_local_backups(self, db_id: int) -> List[Dict[str, Any]]:
+        """Local backups of a database, unsorted"""
+        backups: List[Dict[str, Any]] = []
         backup_dir = self._get_backup_dir(db_id)
         if backup_dir.exists():
-            # Support multiple backup formats (including compressed/encrypted variants)
-            for pattern in [
-                "*.sql",
-                "*.dump",
-                "*.bak",
-                "*.tar.gz",
-                "*.gz",
-                "*.enc",
-                "*.zst",
-                "*.lz4",
-            ]:
-                for f in backup_dir.glob(pattern):
-                    # Skip checksum files
-                    if f.name.endswith(".sha256"):
+            # One directory pass; DirEntry caches the file type, and the
+            # names seen double as the lookup for .sha256 siblings
+            with os.scandir(backup_dir) as it:
+                entries = list(it)
+            names = {e.name for e in entries}
+            for e in entries:
+                # Checksum files never match these suffixes
+                if not e.name.endswith(BACKUP_SUFFIXES):
+                    continue
+
+                try:
+                    if not e.is_file():
                         continue
+                    stat = e.stat()
+                    backups.append(
+                        {
+                            "filename": e.name,
+                            "path": e.path,
+                            "date": datetime.fromtimestamp(
+                                stat.st_mtime, tz=timezone.utc
+                            ),
+                            "size_mb": stat.st_size / (1024 * 1024),
+                            "location": "local",
+                            "has_checksum": f"{e.name}.sha256" in names,
+                        }
+                    )
+                except Exception as ex:
+                    logger.info(f"Error reading local backup {e.path}: {ex}")
+        return backups
 
-                    try:
-                        stat = f.stat()
-                        backups.append(
-                            {
-                                "filename": f.name,
-                                "path": str(f),
-                                "date": datetime.fromtimestamp(
-                                    stat.st_mtime, tz=timezone.utc
-                                ),
-                                "size_mb": stat.st_size / (1024 * 1024),
-                                "location": "local",
-                                "has_checksum": Path(f"{f}.sha256").exists(),
-                            }
-                        )
-                    except Exception as e:
-                        logger.info(f"Error reading local backup {f}: {e}")
+    def list_backups(self, db_id: int) -> List[Dict[str, Any]]:
+        # 1. LOCAL BACKUPS
+        backups = self._list_local_backups(db_id)
 
         # 2. S3 BACKUPS
         try:
@@ -531,6 +678,7 @@ class DBManager:
                 if storage:
                     prefix = f"backups/{db_id}/"
                     s3_files = storage.list_files(prefix)
+                    s3_keys = {f["key"] for f in s3_files}
 
                     for s3_file in s3_files:
                         key = s3_file["key"]
@@ -542,13 +690,8 @@ class DBManager:
                         # s3_file usually contains: key, size, last_modified, etag.
                         # list_files may not include metadata; head calls are expensive.
 
-                        # Check if a .sha256 sibling exists in the list?
-                        # It's expensive to search list for every item.
-                        # Assume integrity if it's in S3 and we uploaded it.
-                        # Or check if key + .sha256 is in the s3_files list logic?
-                        has_checksum = any(
-                            f["key"] == f"{key}.sha256" for f in s3_files
-                        )
+                        # Check if a .sha256 sibling exists in the listing
+                        has_checksum = f"{key}.sha256" in s3_keys
 
                         backups.append(
                             {
@@ -564,7 +707,7 @@ class DBManager:
             logger.info(f"Error listing S3 backups: {e}")
 
         # Sort by date desc
-        return sorted(backups, key=lambda x: x["date"], reverse=True)
+        return sorted(backups, key=itemgetter("date"), reverse=True)
 
     def verify_backup_integrity(
         self,
@@ -620,13 +763,15 @@ class DBManager:
                         "Set the encryption password in Settings → Encryption."
                     )
 
-                # Decrypt to temp directory and verify checksum
+                # Decrypt into a temp directory and verify checksum
                 temp_dir = tempfile.mkdtemp()
                 try:
-                    temp_file = os.path.join(temp_dir, filename)
-                    shutil.copy2(backup_path, temp_file)
                     decrypted_file = decrypt_file(
-                        temp_file, password, remove_encrypted=True
+                        backup_path,
+                        password,
+                        output_path=os.path.join(
+                            temp_dir, os.path.splitext(filename)[0]
+                        ),
                     )
 
                     # Calculate checksum on decrypted file
@@ -771,8 +916,9 @@ class DBManager:
                 or ".gz" in filename
             ):
                 temp_dir_obj = tempfile.mkdtemp()
-                work_file = os.path.join(temp_dir_obj, filename)
-                shutil.copy2(backup_file, work_file)
+                # The backup is read in place; each step writes its output
+                # into the temp dir, so the original is never copied
+                work_file = backup_file
 
                 # Step 1: Decrypt if encrypted
                 if work_file.endswith(".enc"):
@@ -787,7 +933,11 @@ class DBManager:
                             "Backup is encrypted but no encryption password is configured. "
                             "Set the encryption password in Settings → Encryption."
                         )
-                    work_file = decrypt_file(work_file, password, remove_encrypted=True)
+                    work_file = decrypt_file(
+                        work_file,
+                        password,
+                        output_path=os.path.join(temp_dir_obj, Path(work_file).stem),
+                    )
                     decrypted_file = work_file  # Save for checksum verification
                     logger.info(f"🔓 Decrypted: {os.path.basename(work_file)}")
 
@@ -822,7 +972,12 @@ class DBManager:
                         progress.update(
                             message="Decompressing backup...", step="Decompressing"
                         )
-                    work_file = decompress_file(work_file, remove_compressed=True)
+                    work_file = decompress_file(
+                        work_file,
+                        output_path=os.path.join(temp_dir_obj, Path(work_file).stem),
+                        # Intermediate files only; never the original backup
+                        remove_compressed=work_file != backup_file,
+                    )
                     logger.info(f"📦 Decompressed: {os.path.basename(work_file)}")
 
                 actual_restore_file = work_file
@@ -934,13 +1089,24 @@ class DBManager:
 
         results: Dict[str, List[Dict[str, Any]]] = {"success": [], "failed": []}
 
+        # Derive the encryption key once for the whole batch instead of once
+        # per database (100k PBKDF2 rounds each)
+        encryptor: Optional[BatchEncryptor] = None
+        encryption_settings = self.config_manager.get_encryption_settings()
+        password = encryption_settings.get("password")
+        if encryption_settings.get("enabled", False) and password:
+            try:
+                encryptor = BatchEncryptor(password)
+            except Exception as e:
+                logger.info(f"⚠️  Batch encryption unavailable: {e}")
+
         # Helper function for thread
         def _job(db_config: Dict[str, Any]) -> Dict[str, Any]:
             db_id = db_config["id"]
             name = db_config["name"]
             try:
                 # Avoid progress tracker in batch jobs to prevent stdout collisions.
-                path = self.backup_database(db_id)
+                path = self.backup_database(db_id, encryptor=encryptor)
                 return {"id": db_id, "name": name, "status": "success", "path": path}
             except Exception as e:
                 return {"id": db_id, "name": name, "status": "error", "error": str(e)}
@@ -6,6 +6,8 @@ Handles S3-compatible storage (Amazon S3, Minio, Garage)
 import os
 from typing import Any, Dict, List, Optional
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 from core.storage_provider import StorageProvider
 
@@ -13,6 +15,41 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+# Smaller parts leave each request dominated by its own round trip
+MULTIPART_CHUNK_BYTES = 16 * 1024 * 1024
+# S3's limits on the size of one multipart part
+MIN_PART_BYTES = 5 * 1024 * 1024
+MAX_PART_BYTES = 5 * 1024 * 1024 * 1024
+# Most keys a single DeleteObjects request accepts
+DELETE_BATCH_SIZE = 1000
+
+
+def _bounded_int(raw: Any, default: int, low: int, high: int) -> int:
+    try:
+        v = int(str(raw).strip())
+    except ValueError:
+        v = default
+    return max(low, min(v, high))
+
+
+def _s3_max_concurrency() -> int:
+    return _bounded_int(os.getenv("DBMANAGER_S3_MAX_CONCURRENCY", "10"), 10, 1, 64)
+
+
+# Objects above the threshold are moved as multipart transfers whose parts
+# travel over parallel connections; a single stream caps well below link speed.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD_BYTES,
+    multipart_chunksize=MULTIPART_CHUNK_BYTES,
+    max_concurrency=_s3_max_concurrency(),
+    use_threads=True,
+)
+
+# Each transfer thread holds its own pooled connection; botocore's default pool
+# of 10 would make extra threads wait (and log "connection pool is full")
+_CLIENT_CONFIG = BotoConfig(max_pool_connections=max(10, _s3_max_concurrency()))
+
 
 class S3Storage(StorageProvider):
     """
@@ -32,10 +69,36 @@ class S3Storage(StorageProvider):
                 - secret_key: AWS secret key or equivalent
                 - bucket: Bucket name
                 - region: AWS region (default: us-east-1)
+                - max_concurrency: Parallel parts per transfer (optional,
+                  default: DBMANAGER_S3_MAX_CONCURRENCY)
+                - multipart_chunk_mb: Multipart part size in MiB (optional)
         """
         super().__init__(config)
         self.bucket = config["bucket"]
 
+        # Targets may tune their transfers; the shared defaults serve the rest
+        transfer_config = _TRANSFER_CONFIG
+        boto_config = _CLIENT_CONFIG
+        if config.get("max_concurrency") or config.get("multipart_chunk_mb"):
+            max_concurrency = _bounded_int(
+                config.get("max_concurrency") or _s3_max_concurrency(), 10, 1, 64
+            )
+            mib = 1024 * 1024
+            chunk_mb = _bounded_int(
+                config.get("multipart_chunk_mb") or MULTIPART_CHUNK_BYTES // mib,
+                MULTIPART_CHUNK_BYTES // mib,
+                MIN_PART_BYTES // mib,
+                MAX_PART_BYTES // mib,
+            )
+            transfer_config = TransferConfig(
+                multipart_threshold=MULTIPART_THRESHOLD_BYTES,
+                multipart_chunksize=chunk_mb * mib,
+                max_concurrency=max_concurrency,
+                use_threads=True,
+            )
+            boto_config = BotoConfig(max_pool_connections=max(10, max_concurrency))
+        self.transfer_config = transfer_config
+
         # Create S3 client with custom endpoint support
         client_config = {
             "aws_access_key_id": config["access_key"],
@@ -47,7 +110,7 @@ class S3Storage(StorageProvider):
         if config.get("endpoint_url"):
             client_config["endpoint_url"] = config["endpoint_url"]
 
-        self.client = boto3.client("s3", **client_config)
+        self.client = boto3.client("s3", config=boto_config, **client_config)
 
     def upload_file(
         self,
@@ -92,7 +155,11 @@ class S3Storage(StorageProvider):
 
             # Normal Upload
             self.client.upload_file(
-                local_path, self.bucket, remote_path, ExtraArgs=extra_args
+                local_path,
+                self.bucket,
+                remote_path,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config,
             )
             logger.info(f"✅ Uploaded {local_path} to s3://{self.bucket}/{remote_path}")
             return True
@@ -106,6 +173,35 @@ class S3Storage(StorageProvider):
             logger.info(f"❌ S3 upload failed: {e}")
             return False
 
+    def upload_bytes(
+        self, data: bytes, remote_path: str, metadata: Optional[Dict] = None
+    ) -> bool:
+        """
+        Upload in-memory data to S3 with a single PutObject
+
+        Args:
+            data: Content to upload
+            remote_path: S3 object key
+            metadata: Optional metadata to attach to object
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.client.put_object(
+                Bucket=self.bucket, Key=remote_path, Body=data, Metadata=metadata or {}
+            )
+            logger.info(
+                f"✅ Uploaded {len(data)} bytes to s3://{self.bucket}/{remote_path}"
+            )
+            return True
+        except NoCredentialsError:
+            logger.info("❌ No valid credentials for S3")
+            return False
+        except ClientError as e:
+            logger.info(f"❌ S3 upload failed: {e}")
+            return False
+
     def download_file(self, remote_path: str, local_path: str) -> bool:
         """
         Download a file from S3. Resolves deduplication pointers.
@@ -132,7 +228,9 @@ class S3Storage(StorageProvider):
                     f"🔗 Resolving deduplication pointer: {remote_path} -> {target_key}"
                 )
 
-            self.client.download_file(self.bucket, target_key, local_path)
+            self.client.download_file(
+                self.bucket, target_key, local_path, Config=self.transfer_config
+            )
             logger.info(f"✅ Downloaded s3://{self.bucket}/{target_key} to {local_path}")
             return True
         except ClientError as e:
@@ -142,6 +240,48 @@ class S3Storage(StorageProvider):
                 logger.info(f"❌ S3 download failed: {e}")
             return False
 
+    def can_copy_from(self, other: "S3Storage") -> bool:
+        """Whether other's objects are reachable through this client"""
+        return all(
+            self.config.get(field) == other.config.get(field)
+            for field in ("endpoint_url", "region", "access_key", "secret_key")
+        )
+
+    def copy_from(self, source_bucket: str, remote_path: str) -> bool:
+        """
+        Server-side copy of an object from another bucket on the same service.
+        Resolves deduplication pointers, like download_file does.
+
+        Args:
+            source_bucket: Bucket holding the object
+            remote_path: Object key, kept the same in this bucket
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            head = self.client.head_object(Bucket=source_bucket, Key=remote_path)
+            metadata = dict(head.get("Metadata", {}))
+            source_key = metadata.pop("dedup_ref", remote_path)
+
+            # Managed copy: switches to multipart UploadPartCopy above the
+            # transfer threshold, as a single CopyObject caps at 5 GiB
+            self.client.copy(
+                {"Bucket": source_bucket, "Key": source_key},
+                self.bucket,
+                remote_path,
+                ExtraArgs={"Metadata": metadata, "MetadataDirective": "REPLACE"},
+                Config=self.transfer_config,
+            )
+            logger.info(
+                f"✅ Copied s3://{source_bucket}/{source_key} "
+                f"to s3://{self.bucket}/{remote_path}"
+            )
+            return True
+        except ClientError as e:
+            logger.info(f"❌ S3 copy failed: {e}")
+            return False
+
     def list_files(self, prefix: str = "", max_keys: int = 1000) -> List[Dict]:
         """
         List files in S3 bucket with optional prefix
@@ -196,6 +336,41 @@ class S3Storage(StorageProvider):
             logger.info(f"❌ S3 delete failed: {e}")
             return False
 
+    def delete_files(self, remote_paths: List[str]) -> List[str]:
+        """
+        Delete several objects from S3, up to 1000 per request
+
+        Args:
+            remote_paths: S3 object keys to delete
+
+        Returns:
+            Keys that could not be deleted
+        """
+        failed: List[str] = []
+        for start in range(0, len(remote_paths), DELETE_BATCH_SIZE):
+            batch = remote_paths[start : start + DELETE_BATCH_SIZE]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+                )
+            except ClientError as e:
+                logger.info(f"❌ S3 delete failed: {e}")
+                failed.extend(batch)
+                continue
+            errors = response.get("Errors", [])
+            for error in errors:
+                logger.info(
+                    f"❌ S3 delete failed for {error.get('Key')}: "
+                    f"{error.get('Message')}"
+                )
+                failed.append(error.get("Key"))
+            logger.info(
+                f"✅ Deleted {len(batch) - len(errors)} object(s) "
+                f"from s3://{self.bucket}"
+            )
+        return failed
+
     def test_connection(self) -> bool:
         """
         Test S3 bucket connectivity and permissions
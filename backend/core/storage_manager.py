@@ -3,9 +3,8 @@ Storage Manager
 Handles storage configuration CRUD operations and provider instantiation
 """
 
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 from core.storage_provider import StorageProvider
-from core.s3_storage import S3Storage
 
 import logging
 
@@ -26,6 +25,14 @@ class StorageManager:
             config_manager: ConfigManager instance
         """
         self.config_manager = config_manager
+        # Storage id -> position in config["storage_targets"]; see _find_target()
+        self._target_index: Dict[int, int] = {}
+        self._max_target_id = 0
+        self._indexed_targets: Optional[List[Dict[str, Any]]] = None
+        self._indexed_len = 0
+        # Storage id -> (config snapshot, S3Storage). boto3 clients are
+        # thread-safe, so one provider per target can serve every caller
+        self._providers: Dict[int, Tuple[Dict[str, Any], StorageProvider]] = {}
         self._ensure_storage_config()
 
     def _ensure_storage_config(self) -> None:
@@ -52,6 +59,28 @@ class StorageManager:
             List[Dict[str, Any]], self.config_manager.config.get("storage_targets", [])
         )
 
+    def _target_positions(self) -> Dict[int, int]:
+        """Map storage ids to list positions, reindexing if the list changed"""
+        targets = self.list_storage()
+        # Imports and config sync replace the list wholesale, so check it
+        if targets is not self._indexed_targets or len(targets) != self._indexed_len:
+            self._target_index = {
+                t["id"]: i for i, t in enumerate(targets) if "id" in t
+            }
+            self._max_target_id = max(self._target_index, default=0)
+            self._indexed_targets = targets
+            self._indexed_len = len(targets)
+        return self._target_index
+
+    def _find_target(self, storage_id: int) -> Optional[int]:
+        """Position of a storage target in the config list, via an id index"""
+        i = self._target_positions().get(storage_id)
+        if i is None or self.list_storage()[i].get("id") != storage_id:
+            # Miss or stale hit: an entry's id may have been edited in place
+            self._indexed_targets = None
+            i = self._target_positions().get(storage_id)
+        return i
+
     def get_storage_config(self, storage_id: int) -> Optional[Dict[str, Any]]:
         """
         Get storage configuration by ID
@@ -62,10 +91,8 @@ class StorageManager:
         Returns:
             Storage config dict or None if not found
         """
-        for target in self.list_storage():
-            if target.get("id") == storage_id:
-                return target
-        return None
+        i = self._find_target(storage_id)
+        return self.list_storage()[i] if i is not None else None
 
     def add_storage(self, storage_config: Dict) -> int:
         """
@@ -78,16 +105,18 @@ class StorageManager:
             New storage ID
         """
         # Ensure key exists
-        if "storage_targets" not in self.config_manager.config:
-            self.config_manager.config["storage_targets"] = []
+        targets = self.config_manager.config.setdefault("storage_targets", [])
 
         # Generate ID
-        existing_ids = [s.get("id", 0) for s in self.list_storage()]
-        new_id: int = max(existing_ids) + 1 if existing_ids else 1
+        positions = self._target_positions()
+        new_id: int = self._max_target_id + 1
         storage_config["id"] = new_id
 
         # Add to config
-        self.config_manager.config["storage_targets"].append(storage_config)
+        targets.append(storage_config)
+        positions[new_id] = self._indexed_len
+        self._max_target_id = new_id
+        self._indexed_len += 1
         self.config_manager.save_config()
 
         return new_id
@@ -106,15 +135,16 @@ class StorageManager:
         if "storage_targets" not in self.config_manager.config:
             return False
 
-        for i, target in enumerate(self.config_manager.config["storage_targets"]):
-            if target.get("id") == storage_id:
-                # Preserve ID
-                new_config["id"] = storage_id
-                self.config_manager.config["storage_targets"][i] = new_config
-                self.config_manager.save_config()
-                return True
+        i = self._find_target(storage_id)
+        if i is None:
+            return False
 
-        return False
+        # Preserve ID
+        new_config["id"] = storage_id
+        self.config_manager.config["storage_targets"][i] = new_config
+        self._providers.pop(storage_id, None)
+        self.config_manager.save_config()
+        return True
 
     def delete_storage(self, storage_id: int) -> bool:
         """
@@ -152,6 +182,7 @@ class StorageManager:
             ]
 
             if len(self.config_manager.config["storage_targets"]) < original_count:
+                self._providers.pop(storage_id, None)
                 self.config_manager.save_config()
                 return True
 
@@ -182,6 +213,10 @@ class StorageManager:
         """
         Get StorageProvider instance for target
 
+        S3 providers are cached per target and rebuilt when its settings
+        change. SMB providers are created per call: their sessions are not
+        safe to share between threads.
+
         Args:
             storage_id: Storage ID
 
@@ -196,7 +231,16 @@ class StorageManager:
 
         try:
             if provider_type == "s3" or provider_type in ("minio", "garage", "other"):
-                return S3Storage(config)
+                # Lazy import: boto3 takes longer to load than the rest of
+                # the app, and many commands never touch storage
+                from core.s3_storage import S3Storage
+
+                cached = self._providers.get(storage_id)
+                if cached is not None and cached[0] == config:
+                    return cached[1]
+                storage = S3Storage(config)
+                self._providers[storage_id] = (dict(config), storage)
+                return storage
             elif provider_type == "smb":
                 try:
                     # Lazy import to avoid circular dependencies
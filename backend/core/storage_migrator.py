@@ -5,12 +5,20 @@ Handles migration of backups between storage targets
 
 import os
 import tempfile
-from typing import Any, Callable, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import logging
 
+from core.s3_storage import S3Storage
+
 logger = logging.getLogger(__name__)
 
+# Backups copied at once; each copy is network-bound and releases the GIL
+# while waiting on the wire, so throughput scales with concurrent transfers
+MIGRATION_WORKERS = 8
+
 
 class StorageMigrator:
     """
@@ -75,52 +83,112 @@ class StorageMigrator:
             total = len(backups)
             logger.info(f"📦 Found {total} backup(s) to migrate")
 
-            # Migrate each backup
+            # Same S3 service and credentials: the service copies the bytes
+            # itself, nothing passes through this machine
+            server_side = (
+                isinstance(old_storage, S3Storage)
+                and isinstance(new_storage, S3Storage)
+                and new_storage.can_copy_from(old_storage)
+            )
+            if server_side:
+                logger.info("⚡ Same S3 service: using server-side copies")
+
+            # Migrate backups concurrently
             success_count = 0
-            failed_files = []
-
-            with tempfile.TemporaryDirectory() as temp_dir:
-                for i, backup in enumerate(backups, 1):
-                    remote_key = backup["key"]
-                    filename = os.path.basename(remote_key)
-                    temp_path = os.path.join(temp_dir, filename)
-
-                    if progress_callback:
-                        progress_callback(i, total, filename)
+            failed_files: List[str] = []
+            # Sources of migrated backups, deleted in bulk once all are copied
+            to_delete: List[str] = []
+            workers = threading.local()
+
+            def thread_storages() -> Tuple[Any, Any]:
+                # A provider pair per worker: SMB sessions can't be shared
+                if not hasattr(workers, "storages"):
+                    workers.storages = (
+                        self.storage_manager.get_storage(old_storage_id),
+                        self.storage_manager.get_storage(new_storage_id),
+                    )
+                return cast(Tuple[Any, Any], workers.storages)
+
+            def migrate_one(index: int, backup: Dict[str, Any], temp_dir: str) -> bool:
+                remote_key = backup["key"]
+                # Index prefix keeps same-named files from subfolders apart
+                temp_path = os.path.join(
+                    temp_dir, f"{index}_{os.path.basename(remote_key)}"
+                )
+                source, target = thread_storages()
+                if not source or not target:
+                    return False
+
+                try:
+                    if server_side:
+                        if not target.copy_from(source.bucket, remote_key):
+                            return False
                     else:
-                        logger.info(f"  [{i}/{total}] Migrating {filename}...")
-
-                    try:
                         # Download from old storage
-                        if not old_storage.download_file(remote_key, temp_path):
-                            failed_files.append(filename)
-                            continue
+                        if not source.download_file(remote_key, temp_path):
+                            return False
+
+                        # Listings carry no metadata; fetch it so the backup's
+                        # recorded hash moves along instead of being recomputed
+                        metadata = backup.get("metadata")
+                        if metadata is None:
+                            info = source.get_file_info(remote_key)
+                            metadata = info.get("metadata") if info else None
+                        if metadata:
+                            # download_file resolved any dedup pointer, so the
+                            # target gets the full object, not a pointer to a
+                            # key it may not have (as copy_from does)
+                            metadata = dict(metadata)
+                            metadata.pop("dedup_ref", None)
 
                         # Upload to new storage
                         # We use the same key structure
-                        if not new_storage.upload_file(
-                            temp_path, remote_key, backup.get("metadata")
-                        ):
-                            failed_files.append(filename)
-                            continue
+                        if not target.upload_file(temp_path, remote_key, metadata):
+                            return False
+                    return True
+                finally:
+                    # Cleanup temp file
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+
+            # The pool shuts down before the temp dir is removed
+            with (
+                tempfile.TemporaryDirectory() as temp_dir,
+                ThreadPoolExecutor(
+                    max_workers=min(MIGRATION_WORKERS, total),
+                    thread_name_prefix="migrate",
+                ) as pool,
+            ):
+                futures = {
+                    pool.submit(migrate_one, i, backup, temp_dir): backup["key"]
+                    for i, backup in enumerate(backups)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    remote_key = futures[future]
+                    filename = os.path.basename(remote_key)
+                    try:
+                        migrated = future.result()
+                    except Exception as e:
+                        logger.info(f"  ⚠️  Error migrating {filename}: {e}")
+                        migrated = False
 
+                    if migrated:
                         success_count += 1
-
-                        # Delete from old storage if requested
                         if delete_old:
-                            old_storage.delete_file(remote_key)
+                            to_delete.append(remote_key)
+                    else:
+                        failed_files.append(filename)
 
-                        # Cleanup temp file
-                        try:
-                            # Safely remove temp file
-                            if os.path.exists(temp_path):
-                                os.remove(temp_path)
-                        except Exception:
-                            pass
+                    if progress_callback:
+                        progress_callback(done, total, filename)
+                    else:
+                        outcome = "Migrated" if migrated else "Failed to migrate"
+                        logger.info(f"  [{done}/{total}] {outcome} {filename}")
 
-                    except Exception as e:
-                        logger.info(f"  ⚠️  Error migrating {filename}: {e}")
-                        failed_files.append(filename)
+            # Delete from old storage if requested
+            if to_delete:
+                for remote_key in old_storage.delete_files(to_delete):
+                    logger.info(f"  ⚠️  Failed to delete {remote_key} from old storage")
 
             # Summary
             logger.info(f"\n✅ Migration complete: {success_count}/{total} successful")
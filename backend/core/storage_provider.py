@@ -3,6 +3,8 @@ Storage Provider Interface
 Abstract base class for all storage providers (S3, SMB, etc.)
 """
 
+import os
+import tempfile
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
@@ -44,6 +46,31 @@ class StorageProvider(ABC):
         """
         pass
 
+    def upload_bytes(
+        self, data: bytes, remote_path: str, metadata: Optional[Dict] = None
+    ) -> bool:
+        """
+        Upload in-memory data to remote storage
+
+        Providers that can send a buffer directly override this; the default
+        goes through a temporary file.
+
+        Args:
+            data: Content to upload
+            remote_path: Destination path in remote storage
+            metadata: Optional metadata to attach (if supported)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        fd, temp_path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return self.upload_file(temp_path, remote_path, metadata)
+        finally:
+            os.remove(temp_path)
+
     @abstractmethod
     def download_file(self, remote_path: str, local_path: str) -> bool:
         """
@@ -91,6 +118,21 @@ class StorageProvider(ABC):
         """
         pass
 
+    def delete_files(self, remote_paths: List[str]) -> List[str]:
+        """
+        Delete several files from remote storage
+
+        Providers with a bulk delete API override this; the default deletes
+        one file at a time.
+
+        Args:
+            remote_paths: Paths of files to delete
+
+        Returns:
+            Paths that could not be deleted
+        """
+        return [path for path in remote_paths if not self.delete_file(path)]
+
     @abstractmethod
     def test_connection(self) -> bool:
         """
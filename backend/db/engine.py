@@ -1,11 +1,10 @@
-import os
-from pathlib import Path
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy import event
 
-CONFIG_DIR = Path(os.getenv("DBMANAGER_DATA_DIR", Path.home() / ".dbmanager"))
+from config import CONFIG_DIR
+
 DB_PATH = CONFIG_DIR / "dbmanager.db"
 
 DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
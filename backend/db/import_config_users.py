@@ -3,18 +3,14 @@
 import json
 import logging
 import shutil
-from pathlib import Path
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import CONFIG_DIR, CONFIG_FILE
 from db.repositories.users_repo import count_users, create_user
 
 logger = logging.getLogger(__name__)
 
-CONFIG_DIR = Path(
-    __import__("os").getenv("DBMANAGER_DATA_DIR", str(Path.home() / ".dbmanager"))
-)
-CONFIG_FILE = CONFIG_DIR / "config.json"
 CONFIG_BACKUP = CONFIG_DIR / "config.json.pre-rbac.bak"
 
 
@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# config.py reads this at import: keep the config, keys and secrets written by
+# the code under test out of the real ~/.dbmanager
+os.environ["DBMANAGER_DATA_DIR"] = tempfile.mkdtemp(prefix="dbmanager-tests-")
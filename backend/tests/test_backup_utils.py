@@ -0,0 +1,80 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from typing import Any
+from unittest import mock
+
+from core import backup_utils
+from core.backup_utils import calculate_checksum, verify_backup
+
+DATA = b"backup contents\n"
+
+
+class VerifyBackupTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.backup = os.path.join(self.tmp, "backup.sql")
+        with open(self.backup, "wb") as f:
+            f.write(DATA)
+
+    def _write_sidecar(self, content: bytes) -> None:
+        with open(f"{self.backup}.sha256", "wb") as f:
+            f.write(content)
+
+    def test_matching_checksum(self) -> None:
+        digest = hashlib.sha256(DATA).hexdigest()
+        self._write_sidecar(f"{digest}  backup.sql\n".encode())
+        result = verify_backup(self.backup)
+        self.assertTrue(result["valid"])
+        self.assertTrue(result["checksum_valid"])
+
+    def test_checksum_written_by_other_tools(self) -> None:
+        digest = hashlib.sha256(DATA).hexdigest().upper()
+        self._write_sidecar(f"  {digest} *backup.sql\r\n".encode())
+        result = verify_backup(self.backup)
+        self.assertTrue(result["valid"])
+        self.assertTrue(result["checksum_valid"])
+
+    def test_missing_checksum_is_left_unchecked(self) -> None:
+        result = verify_backup(self.backup)
+        self.assertTrue(result["valid"])
+        self.assertIsNone(result["checksum_valid"])
+
+    def test_unreadable_checksum_is_reported(self) -> None:
+        self._write_sidecar(b"\xff\xfe not utf-8")
+        result = verify_backup(self.backup)
+        self.assertFalse(result["valid"])
+        self.assertFalse(result["checksum_valid"])
+        self.assertEqual(len(result["errors"]), 1)
+
+
+class FailingHasher:
+    def update(self, data: Any) -> None:
+        raise RuntimeError("hash failed")
+
+
+class ReadAheadTest(unittest.TestCase):
+    def test_failed_hash_stops_the_reader(self) -> None:
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "big.bin")
+        # Large enough to take the read-ahead path, with more chunks than the
+        # reader has buffers
+        with open(path, "wb") as f:
+            f.truncate(backup_utils.READ_AHEAD_MIN_BYTES + 1)
+
+        with mock.patch.dict(backup_utils._HASHERS, {"sha256": FailingHasher}):
+            with mock.patch.object(backup_utils, "MMAP_MIN_BYTES", 1 << 62):
+                with self.assertRaises(RuntimeError):
+                    calculate_checksum(path)
+
+        readers = [t for t in threading.enumerate() if t.name == "checksum-read"]
+        self.assertEqual(readers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from config import JWT_SECRET_FILE, ConfigManager
+from core.auth import AuthManager
+from utils.config_export import ConfigExporter
+
+
+class JwtSecretExportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.config_manager = ConfigManager()
+        self.exporter = ConfigExporter(self.config_manager)
+        self.secret = AuthManager(self.config_manager).secret_key
+
+    def _install_elsewhere(self) -> None:
+        # A fresh install: no secret yet, a new one would be generated
+        JWT_SECRET_FILE.unlink()
+
+    def test_zip_export_carries_jwt_secret(self) -> None:
+        path = self.exporter.export_config(os.path.join(self.tmp, "export.zip"))
+        self._install_elsewhere()
+
+        summary = self.exporter.import_config(path)
+
+        self.assertTrue(summary["jwt_secret_restored"])
+        self.assertEqual(AuthManager(self.config_manager).secret_key, self.secret)
+
+    def test_json_export_carries_jwt_secret(self) -> None:
+        path = self.exporter.export_to_json(os.path.join(self.tmp, "export.json"))
+        with open(path) as f:
+            self.assertNotIn(self.secret, f.read())
+        self._install_elsewhere()
+
+        self.exporter.import_from_json(path)
+
+        self.assertEqual(AuthManager(self.config_manager).secret_key, self.secret)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from config import JWT_SECRET_FILE, ConfigManager
+from core.auth import AuthManager
+from core.config_sync import ConfigSync
+
+
+class MemoryStorage:
+    """In-memory stand-in for a storage provider"""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+
+    def upload_bytes(
+        self, data: bytes, remote_path: str, metadata: Optional[Dict] = None
+    ) -> bool:
+        self.files[remote_path] = data
+        self.metadata[remote_path] = dict(metadata or {})
+        return True
+
+    def upload_file(
+        self, local_path: str, remote_path: str, metadata: Optional[Dict] = None
+    ) -> bool:
+        with open(local_path, "rb") as f:
+            return self.upload_bytes(f.read(), remote_path, metadata)
+
+    def download_file(self, remote_path: str, local_path: str) -> bool:
+        if remote_path not in self.files:
+            return False
+        with open(local_path, "wb") as f:
+            f.write(self.files[remote_path])
+        return True
+
+    def get_file_info(self, remote_path: str) -> Optional[Dict[str, Any]]:
+        if remote_path not in self.files:
+            return None
+        return {
+            "key": remote_path,
+            "last_modified": datetime.now(timezone.utc),
+            "metadata": self.metadata[remote_path],
+        }
+
+
+class FakeStorageManager:
+    def __init__(self, storage: MemoryStorage) -> None:
+        self.storage = storage
+
+    def get_storage_config(self, target_id: int) -> Dict[str, Any]:
+        return {"id": target_id}
+
+    def get_storage(self, target_id: int) -> MemoryStorage:
+        return self.storage
+
+    def get_storage_name(self, target_id: int) -> str:
+        return "memory"
+
+
+class JwtSecretSyncTest(unittest.TestCase):
+    def test_sync_carries_jwt_secret(self) -> None:
+        config_manager = ConfigManager()
+        config_manager.save_config()
+        # Set in memory only, so saving doesn't start the background sync
+        config_manager.config["config_sync_bucket_id"] = 1
+        secret = AuthManager(config_manager).secret_key
+
+        storage = MemoryStorage()
+        config_sync = ConfigSync(FakeStorageManager(storage), config_manager)
+        self.assertTrue(config_sync.sync_to_storage(silent=True))
+        self.assertNotIn(secret.encode(), storage.files["config/jwt.key"])
+
+        # A new host: no secret yet, a new one would be generated
+        JWT_SECRET_FILE.unlink()
+        self.assertTrue(config_sync.sync_from_storage(force=True))
+
+        self.assertEqual(AuthManager(config_manager).secret_key, secret)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from core.buffer_pool import buffer_pool
+from core.encryption import (
+    CIPHER_OVERHEAD,
+    ENCRYPTION_CHUNK_SIZE,
+    NONCE_SIZE,
+    SALT_SIZE,
+    EncryptedWriter,
+)
+
+
+class EncryptedWriterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def _writer(self) -> EncryptedWriter:
+        return EncryptedWriter(
+            os.path.join(self.tmp, "out.enc"),
+            os.urandom(32),
+            os.urandom(SALT_SIZE),
+            os.urandom(NONCE_SIZE),
+        )
+
+    def test_close_then_raise_releases_buffer_once(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with self._writer() as writer:
+                writer.write(b"data")
+                writer.close()
+                raise RuntimeError("after close")
+
+        size = ENCRYPTION_CHUNK_SIZE + CIPHER_OVERHEAD
+        first = buffer_pool.acquire(size)
+        second = buffer_pool.acquire(size)
+        self.addCleanup(buffer_pool.release, first)
+        self.addCleanup(buffer_pool.release, second)
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
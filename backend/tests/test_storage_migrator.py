@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from core.s3_storage import S3Storage
+from core.storage_migrator import StorageMigrator
+
+
+class FakeS3Client:
+    """In-memory stand-in for the boto3 S3 calls the migrator goes through"""
+
+    def __init__(self) -> None:
+        self.objects: Dict[Tuple[str, str], Tuple[bytes, Dict[str, str]]] = {}
+
+    def _get(self, bucket: str, key: str) -> Tuple[bytes, Dict[str, str]]:
+        try:
+            return self.objects[(bucket, key)]
+        except KeyError:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+
+    def head_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        body, metadata = self._get(Bucket, Key)
+        return {
+            "ContentLength": len(body),
+            "LastModified": datetime.now(timezone.utc),
+            "ETag": '"etag"',
+            "Metadata": dict(metadata),
+        }
+
+    def put_object(
+        self, Bucket: str, Key: str, Body: bytes, Metadata: Dict[str, str]
+    ) -> None:
+        self.objects[(Bucket, Key)] = (Body, dict(Metadata))
+
+    def upload_file(
+        self, Filename: str, Bucket: str, Key: str, ExtraArgs: Dict, Config: Any
+    ) -> None:
+        with open(Filename, "rb") as f:
+            self.objects[(Bucket, Key)] = (f.read(), dict(ExtraArgs["Metadata"]))
+
+    def download_file(
+        self, Bucket: str, Key: str, Filename: str, Config: Any = None
+    ) -> None:
+        body, _ = self._get(Bucket, Key)
+        with open(Filename, "wb") as f:
+            f.write(body)
+
+    def list_objects_v2(
+        self, Bucket: str, Prefix: str, MaxKeys: int = 1000
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "Contents": [
+                {
+                    "Key": key,
+                    "Size": len(body),
+                    "LastModified": datetime.now(timezone.utc),
+                    "ETag": '"etag"',
+                }
+                for (bucket, key), (body, _) in self.objects.items()
+                if bucket == Bucket and key.startswith(Prefix)
+            ]
+        }
+
+
+class FakeStorageManager:
+    def __init__(self, storages: Dict[int, S3Storage]) -> None:
+        self.storages = storages
+
+    def get_storage(self, storage_id: int) -> Optional[S3Storage]:
+        return self.storages.get(storage_id)
+
+    def get_storage_name(self, storage_id: int) -> str:
+        return f"storage {storage_id}"
+
+
+def _s3_storage(bucket: str, access_key: str, client: FakeS3Client) -> S3Storage:
+    storage = S3Storage(
+        {"bucket": bucket, "access_key": access_key, "secret_key": "secret"}
+    )
+    storage.client = client
+    return storage
+
+
+class MigrateDedupPointerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_pointer_is_migrated_as_a_full_object(self) -> None:
+        # Different credentials: no server-side copy, the migrator downloads
+        # and re-uploads
+        source_client, target_client = FakeS3Client(), FakeS3Client()
+        source = _s3_storage("old", "key-a", source_client)
+        target = _s3_storage("new", "key-b", target_client)
+
+        data = b"full backup contents"
+        source_client.put_object(
+            Bucket="old",
+            Key="blobs/abc",
+            Body=data,
+            Metadata={"checksum": "abc"},
+        )
+        source_client.put_object(
+            Bucket="old",
+            Key="backups/1/backup.sql",
+            Body=b"DEDUP_POINTER",
+            Metadata={"checksum": "abc", "dedup_ref": "blobs/abc"},
+        )
+
+        migrator = StorageMigrator(FakeStorageManager({1: source, 2: target}))
+        self.assertTrue(migrator.migrate_database_backups(1, 1, 2))
+
+        _, metadata = target_client.objects[("new", "backups/1/backup.sql")]
+        self.assertNotIn("dedup_ref", metadata)
+        self.assertEqual(metadata["checksum"], "abc")
+
+        restored = os.path.join(self.tmp, "backup.sql")
+        self.assertTrue(target.download_file("backups/1/backup.sql", restored))
+        with open(restored, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,13 +8,45 @@ from typing import Any, Dict, Optional
 import zipfile
 import tempfile
 
-from config import ConfigManager, CONFIG_DIR, CONFIG_FILE
+from config import ConfigManager, CONFIG_DIR, CONFIG_FILE, JWT_SECRET_FILE
 
 # Proxy config lives next to config.json — included in exports so a fresh
 # install can be restored to an identical state from a single zip.
 PROXY_CONFIG_FILENAME = "proxy.json"
 PROXY_CONFIG_FILE = CONFIG_DIR / PROXY_CONFIG_FILENAME
 
+# The JWT signing secret travels too, or every issued token stops working on a
+# restored install. It's Fernet-encrypted like the secrets inside config.json.
+JWT_SECRET_FILENAME = "jwt.key"
+
+
+def read_jwt_secret_token(config_manager: Any) -> Optional[str]:
+    """The JWT secret, encrypted for export; None if none was created yet"""
+    try:
+        secret = JWT_SECRET_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return str(config_manager.security.encrypt(secret)) if secret else None
+
+
+def restore_jwt_secret_token(config_manager: Any, token: str) -> bool:
+    """
+    Install a JWT secret exported by read_jwt_secret_token
+
+    Returns:
+        False if this install's master key can't decrypt it
+    """
+    token = token.strip()
+    secret = config_manager.security.decrypt(token)
+    if not secret or secret == token:
+        # decrypt() hands back what it can't decrypt
+        return False
+
+    from core.auth import restore_jwt_secret
+
+    restore_jwt_secret(secret)
+    return True
+
 
 class ConfigExporter:
     """Export and import configuration"""
@@ -45,7 +77,9 @@ class ConfigExporter:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
 
-            # Copy config.json
+            # Copy config.json (written on first save, so flush fresh defaults)
+            if not CONFIG_FILE.exists():
+                self.config_manager.save_config()
             config_export = temp_path / "config.json"
             shutil.copy2(CONFIG_FILE, config_export)
 
@@ -53,12 +87,17 @@ class ConfigExporter:
             if PROXY_CONFIG_FILE.exists():
                 shutil.copy2(PROXY_CONFIG_FILE, temp_path / PROXY_CONFIG_FILENAME)
 
+            jwt_token = read_jwt_secret_token(self.config_manager)
+            if jwt_token:
+                (temp_path / JWT_SECRET_FILENAME).write_text(jwt_token)
+
             # Create export metadata
             metadata = {
                 "export_date": datetime.now().isoformat(),
                 "version": "1.1",
                 "includes_backups": include_backups,
                 "includes_proxy": PROXY_CONFIG_FILE.exists(),
+                "includes_jwt_secret": jwt_token is not None,
             }
 
             with open(temp_path / "metadata.json", "w") as f:
@@ -140,13 +179,15 @@ class ConfigExporter:
                 existing_db_names = {
                     db["name"] for db in current_config.get("databases", [])
                 }
-                for db in imported_config.get("databases", []):
-                    if db["name"] not in existing_db_names:
-                        # Assign new ID
-                        db_copy = db.copy()
-                        db_copy.pop("id", None)
-                        self.config_manager.add_database(db_copy)
-                        summary["databases_imported"] += 1
+                # One save for the whole loop instead of one per database
+                with self.config_manager.batch():
+                    for db in imported_config.get("databases", []):
+                        if db["name"] not in existing_db_names:
+                            # Assign new ID
+                            db_copy = db.copy()
+                            db_copy.pop("id", None)
+                            self.config_manager.add_database(db_copy)
+                            summary["databases_imported"] += 1
 
                 # Merge S3 buckets
                 existing_bucket_names = {
@@ -199,6 +240,14 @@ class ConfigExporter:
                 shutil.copy2(proxy_src, PROXY_CONFIG_FILE)
                 summary["proxy_restored"] = True
 
+            # Restore the JWT secret, so tokens issued before the export
+            # stay valid
+            jwt_src = temp_path / JWT_SECRET_FILENAME
+            if jwt_src.exists():
+                summary["jwt_secret_restored"] = restore_jwt_secret_token(
+                    self.config_manager, jwt_src.read_text()
+                )
+
             # Restore backups if requested
             if restore_backups and metadata.get("includes_backups"):
                 backups_source = temp_path / "backups"
@@ -250,6 +299,7 @@ class ConfigExporter:
             "version": "1.1",
             "config": self.config_manager.config,
             "proxy": proxy_data,
+            "jwt_secret": read_jwt_secret_token(self.config_manager),
         }
 
         with open(output_path_obj, "w") as f:
@@ -285,6 +335,9 @@ class ConfigExporter:
                 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
                 with open(PROXY_CONFIG_FILE, "w") as f:
                     json.dump(proxy_data, f, indent=2)
+            jwt_token = import_data.get("jwt_secret")
+            if jwt_token:
+                restore_jwt_secret_token(self.config_manager, jwt_token)
         else:
             # Assume direct config format
             imported_config = import_data
@@ -1,8 +1,10 @@
 import os
 import shutil
+from functools import lru_cache
 from typing import Any, List, Optional, cast
 
-from rich.console import Console
+from rich.console import Console, Group
+from rich.text import Text
 from InquirerPy import inquirer
 
 # Fix for Docker environments where terminal size might be (0, 0)
@@ -30,12 +32,45 @@ shutil.get_terminal_size = _patched_get_terminal_size
 console = Console()
 
 
-def print_header() -> None:
+# Static banner, built once and emitted as a single renderable
+_HEADER = Group(
+    Text.from_markup("[bold cyan]DB Manager CLI[/bold cyan]", justify="center"),
+    Text("Manage your databases with ease", style="italic", justify="center"),
+    Text("-" * 50, justify="center"),
+    Text("\n"),
+)
+
+
+@lru_cache(maxsize=64)
+def _render_header(title: Optional[str], width: int) -> str:
+    """Render the banner (and optional section title) once per title and width
+
+    Menus redraw the same header on every loop iteration; replaying the
+    captured output skips Rich's markup parsing and layout on each redraw.
+    """
+    renderable: Any = _HEADER
+    if title is not None:
+        renderable = Group(
+            _HEADER, Text.from_markup(f"\n[bold cyan]═══ {title} ═══[/bold cyan]\n")
+        )
+    with console.capture() as capture:
+        console.print(renderable, width=width)
+    return capture.get()
+
+
+def _draw_header(title: Optional[str]) -> None:
     console.clear()
-    console.print("[bold cyan]DB Manager CLI[/bold cyan]", justify="center")
-    console.print("Manage your databases with ease", justify="center", style="italic")
-    console.print("-" * 50, justify="center")
-    console.print("\n")
+    console.file.write(_render_header(title, console.width))
+    console.file.flush()
+
+
+def print_header() -> None:
+    _draw_header(None)
+
+
+def print_menu_header(title: str) -> None:
+    """Clear the screen and draw the banner plus a section title in one render"""
+    _draw_header(title)
 
 
 def get_input(prompt_text: str, default: Optional[str] = None) -> str:
@@ -48,6 +83,22 @@ def get_confirm(prompt_text: str, default: bool = True) -> bool:
     return cast(bool, inquirer.confirm(message=prompt_text, default=default).execute())
 
 
+def get_number(
+    prompt_text: str,
+    default: int,
+    min_allowed: Optional[int] = None,
+    max_allowed: Optional[int] = None,
+) -> int:
+    return int(
+        inquirer.number(
+            message=prompt_text,
+            default=default,
+            min_allowed=min_allowed,
+            max_allowed=max_allowed,
+        ).execute()
+    )
+
+
 def get_selection(message: str, choices: List[Any], default: Any = None) -> Any:
     return inquirer.select(
         message=message, choices=choices, default=default, pointer=">"